@@ -1,12 +1,31 @@
 import streamlit as st
-import io
-import json
+import os
 import pandas as pd
-import datetime
 from datetime import timedelta
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseDownload
+
+from janelas import metricas
+from janelas.fonte import DashboardSource, source_modified_times
+from janelas.horarios import STATUS_CLOSED, STATUS_OPEN, next_windows, now_local, window_status
+from janelas.indice import UnifiedIndex
+from janelas.tabelas import build_day_table_html
+from janelas.terminais import TERMINAL_REGISTRY, load_terminal_plugins
+
+# Terminais adicionais declarados em JANELAS_TERMINAL_MODULES.
+load_terminal_plugins()
+
+# Logs JSON das métricas (JANELAS_METRICS_LOG); o Streamlit não configura o logging do app.
+metricas.enable_json_log()
+
+# Horizonte padrão das tabelas diárias (D até D+N) e quantos dias cabem em cada página.
+HORIZON_DAYS = int(os.environ.get("JANELAS_HORIZON_DAYS", "2"))
+MAX_HORIZON_DAYS = 13
+DAYS_PER_PAGE = 3
+
+# Painel de desempenho na sidebar: aberto com ?admin=1 na URL ou JANELAS_ADMIN=1.
+ADMIN_PANEL = os.environ.get("JANELAS_ADMIN", "") == "1"
+
+# Intervalo (em segundos) da atualização automática do painel; 0 desativa.
+REFRESH_SECONDS = int(os.environ.get("JANELAS_REFRESH_SECONDS", "60"))
 
 # Configuração da página
 st.set_page_config(page_title="Dashboard de Janelas", layout="wide")
@@ -49,14 +68,6 @@ st.markdown(
         .card-alert:hover {
             transform: translateY(-5px);
         }
-        .card-rio {
-            background: linear-gradient(to right, #F37529, #FF9B52);
-            color: white;
-        }
-        .card-multirio {
-            background: linear-gradient(to right, #00397F, #0052B9);
-            color: white;
-        }
         /* Estilização das tabelas */
         .stDataFrame {
             border-radius: 10px;
@@ -75,6 +86,35 @@ st.markdown(
         .stDataFrame td {
             padding: 10px 8px !important;
         }
+        /* Tabelas diárias (HTML pré-montado em janelas/tabelas.py) */
+        .tabela-janelas-container {
+            max-height: 420px;
+            overflow-y: auto;
+            border-radius: 0 0 10px 10px;
+            box-shadow: 0 4px 12px rgba(0, 0, 0, 0.08);
+        }
+        .tabela-janelas {
+            width: 100%;
+            border-collapse: collapse;
+            font-size: 14px;
+        }
+        .tabela-janelas th {
+            position: sticky;
+            top: 0;
+            background-color: #f0f2f6;
+            color: #444;
+            font-weight: 600;
+            padding: 12px 8px;
+            text-align: center;
+        }
+        .tabela-janelas td {
+            padding: 10px 8px;
+            text-align: center;
+        }
+        .tabela-janelas td.disp-alta { background-color: rgba(76, 175, 80, 0.3); font-weight: bold; }
+        .tabela-janelas td.disp-media { background-color: rgba(255, 193, 7, 0.3); }
+        .tabela-janelas td.disp-zero { background-color: rgba(244, 67, 54, 0.2); color: #999; }
+        .tabela-janelas td.disp-baixa { background-color: rgba(244, 67, 54, 0.3); }
         /* Cabeçalho dos dias (D, D+1, D+2) */
         .day-header {
             background: linear-gradient(to right, #333, #777);
@@ -119,6 +159,22 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
+# Cores de cada terminal registrado (cartões de alerta e linhas das tabelas diárias).
+st.markdown(
+    "<style>"
+    + "".join(
+        f"""
+        .card-{adapter.css_slug} {{
+            background: linear-gradient(to right, {adapter.color}, {adapter.accent_color});
+            color: white;
+        }}
+        .tabela-janelas tr.linha-{adapter.css_slug} {{ background-color: {adapter.color}; color: white; }}"""
+        for adapter in TERMINAL_REGISTRY.values()
+    )
+    + "</style>",
+    unsafe_allow_html=True,
+)
+
 # =============================================================================
 # SIDEBAR MELHORADA
 # =============================================================================
@@ -141,10 +197,19 @@ with st.sidebar:
     st.markdown("---")
     
     st.subheader("Filtros")
+    # O filtro só fatia o índice já em cache: mudar a seleção não baixa nem reprocessa as planilhas.
     terminal_filter = st.multiselect(
         "Terminal:",
-        options=["Multirio", "Rio Brasil Terminal"],
-        default=["Multirio", "Rio Brasil Terminal"]
+        options=list(TERMINAL_REGISTRY),
+        default=list(TERMINAL_REGISTRY),
+        key="terminal_filter",
+    )
+    horizon = st.slider(
+        "Horizonte de planejamento (D+N):",
+        min_value=0,
+        max_value=MAX_HORIZON_DAYS,
+        value=min(HORIZON_DAYS, MAX_HORIZON_DAYS),
+        key="horizon_days",
     )
 
 # =============================================================================
@@ -161,227 +226,43 @@ st.markdown(
 )
 
 # =============================================================================
-# FUNÇÕES DE CARREGAMENTO DOS DADOS
+# CARREGAMENTO DOS DADOS
 # =============================================================================
-def load_spreadsheet(file_id: str, sheet_name: str = 0) -> pd.DataFrame:
-    """
-    Faz o download de um arquivo do Google Drive (Google Sheets ou Excel)
-    e retorna um DataFrame.
-    """
-    credentials_path = "/home/dev/Documentos/Dash-Janelas/gdrive_credentials.json"
-    with open(credentials_path, 'r') as f:
-        credentials_info = json.load(f)
-    credentials = service_account.Credentials.from_service_account_info(credentials_info)
-    
-    drive_service = build('drive', 'v3', credentials=credentials)
-    file_metadata = drive_service.files().get(fileId=file_id, fields='mimeType').execute()
-    mime_type = file_metadata.get('mimeType')
-    
-    fh = io.BytesIO()
-    if mime_type == "application/vnd.google-apps.spreadsheet":
-        request = drive_service.files().export_media(
-            fileId=file_id,
-            mimeType='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-    else:
-        request = drive_service.files().get_media(fileId=file_id)
-    
-    downloader = MediaIoBaseDownload(fh, request)
-    done = False
-    while not done:
-        status, done = downloader.next_chunk()
-    fh.seek(0)
-    
-    df = pd.read_excel(fh, sheet_name=sheet_name)
-    return df
+@st.cache_resource
+def get_source() -> DashboardSource:
+    # Snapshot da ingestão, cache das planilhas e pipeline incremental, compartilhados entre sessões.
+    return DashboardSource()
 
-def load_janelas_multirio_data() -> pd.DataFrame:
-    """
-    Carrega a planilha do Multirio (Google Sheets) via file_id.
-    """
-    file_id = "1gzqhOADx-VJstLHvM7VVm3iuGUuz3Vgu"  # ID da planilha janelas_multirio_corrigido.xlsx
-    return load_spreadsheet(file_id)
+def format_source_times(revisions: dict) -> str:
+    return " · ".join(
+        f"{TERMINAL_REGISTRY[terminal].label if terminal in TERMINAL_REGISTRY else terminal} {modified.strftime('%d/%m/%Y %H:%M')}"
+        for terminal, modified in source_modified_times(revisions).items()
+    )
 
-def load_informacoes_janelas_data() -> pd.DataFrame:
+def render_if_changed(slot: str, fingerprint, build):
     """
-    Carrega a planilha do Rio Brasil Terminal (Google Sheets) via file_id.
+    Exibe o HTML do componente `slot`, reconstruindo-o só quando a impressão
+    digital dos dados que ele mostra mudou desde o último ciclo de atualização.
     """
-    file_id = "1fMeKSdRvZod7FkvWLKXwsZV32W6iSmbI"  # ID da nova planilha data.xlsx
-    return load_spreadsheet(file_id)
-
-# =============================================================================
-# FUNÇÕES AUXILIARES PARA TRATAR OS HORÁRIOS
-# =============================================================================
-def get_end_hour(row: pd.Series):
-    try:
-        parts = row["Horário"].split(" - ")
-        end_str = parts[1]
-        return int(end_str.split(":")[0])
-    except:
-        return None
-
-def get_start_hour(row: pd.Series):
-    try:
-        parts = row["Horário"].split(" - ")
-        start_str = parts[0]
-        return int(start_str.split(":")[0])
-    except:
-        return None
-
-def get_window_order(row: pd.Series, current_hour: int):
-    try:
-        start_hour = get_start_hour(row)
-        end_hour = get_end_hour(row)
-        if start_hour is None or end_hour is None:
-            return 24
-        if current_hour < start_hour:
-            return start_hour
-        elif current_hour < end_hour:
-            return current_hour
-        else:
-            return 24
-    except:
-        return 24
-
-# =============================================================================
-# CARREGAMENTO DOS DADOS COM INDICADOR DE PROGRESSO
-# =============================================================================
-with st.spinner('Carregando dados das janelas...'):
-    try:
-        df_multirio = load_janelas_multirio_data()
-        df_info = load_informacoes_janelas_data()
-    except Exception as e:
-        st.error(f"Erro ao carregar os dados das planilhas: {e}")
-        st.stop()
-st.success('Dados carregados com sucesso!', icon="✅")
-
-# =============================================================================
-# MAPEAMENTO DE COLUNAS PARA A PLANILHA DA MULTIRIO
-# =============================================================================
-disp_cols = [
-    "ENTREGA CHEIO Disp.",
-    "ENTREGA VAZIO Disp.",
-    "RETIRADA CHEIO Disp.",
-    "RETIRADA VAZIO Disp.",
-    "RETIRADA CARGA SOLTA Disp."
-]
-expected_multirio_cols = ["Data", "JANELAS MULTIRIO"] + disp_cols
-
-if not set(expected_multirio_cols).issubset(df_multirio.columns):
-    st.error("A planilha Multirio não tem as colunas esperadas (Data, JANELAS MULTIRIO, etc.).")
-    st.stop()
-
-df_multirio_unified = df_multirio[expected_multirio_cols].copy()
-df_multirio_unified.rename(columns={"JANELAS MULTIRIO": "Horário"}, inplace=True)
-df_multirio_unified["Terminal"] = "Multirio"
-df_multirio_unified["Data"] = pd.to_datetime(df_multirio_unified["Data"], errors="coerce", dayfirst=True).dt.date
-
-rename_map_multirio = {
-    "ENTREGA CHEIO Disp.": "ECH",
-    "ENTREGA VAZIO Disp.": "EVZ",
-    "RETIRADA CHEIO Disp.": "RCH",
-    "RETIRADA VAZIO Disp.": "RVZ",
-    "RETIRADA CARGA SOLTA Disp.": "RCS"
-}
-df_multirio_unified.rename(columns=rename_map_multirio, inplace=True)
-
-# =============================================================================
-# PROCESSAMENTO DA PLANILHA DO RIO BRASIL TERMINAL
-# =============================================================================
-required_cols_rio = {"DATA", "HORA", "DESCRICAO", "DISPONÍVEL", "RESERVADA"}
-if not required_cols_rio.issubset(df_info.columns):
-    st.error(
-        "A planilha Rio Brasil Terminal não possui as colunas mínimas esperadas: "
-        "DATA, HORA, DESCRICAO, DISPONÍVEL, RESERVADA."
-    )
-    st.stop()
-
-df_info_renamed = df_info.copy()
-df_info_renamed.rename(columns={"DATA": "Data", "HORA": "Horário"}, inplace=True)
-
-for col in ["DISPONÍVEL", "RESERVADA"]:
-    df_info_renamed[col] = pd.to_numeric(df_info_renamed[col], errors="coerce").fillna(0)
-
-df_info_renamed["ECH"] = 0
-df_info_renamed["EVZ"] = 0
-df_info_renamed["RCH"] = 0
-df_info_renamed["RVZ"] = 0
-df_info_renamed["RCS"] = 0
-
-desc_to_col = {
-    "EXPORTAÇÃO CHEIO": "ECH",
-    "IMPORTAÇÃO CHEIO": "RCH",
-    "EXPORTAÇÃO VAZIO": "EVZ",
-    "IMPORTAÇÃO VAZIO": "RVZ",
-    "ENTREGA CARGA SOLTA": "RCS"
-}
-
-for desc, col_alvo in desc_to_col.items():
-    mask = df_info_renamed["DESCRICAO"] == desc
-    df_info_renamed.loc[mask, col_alvo] = df_info_renamed.loc[mask, "DISPONÍVEL"] - df_info_renamed.loc[mask, "RESERVADA"]
-
-df_info_renamed["Terminal"] = "Rio Brasil Terminal"
-df_info_renamed["Data"] = pd.to_datetime(df_info_renamed["Data"], errors="coerce", dayfirst=True).dt.date
-
-df_info_unified = df_info_renamed[["Data", "Horário", "ECH", "EVZ", "RCH", "RVZ", "RCS", "Terminal"]].copy()
-
-# =============================================================================
-# UNIFICAÇÃO DOS DOIS DATAFRAMES E AGRUPAMENTO
-# =============================================================================
-df_unified = pd.concat([df_multirio_unified, df_info_unified], ignore_index=True)
-df_unified = df_unified.groupby(["Data", "Horário", "Terminal"], as_index=False).sum()
-
-# Variáveis globais para filtragem por horário
-today = datetime.date.today()
-current_hour = datetime.datetime.now().hour
+    rendered = st.session_state.setdefault("rendered_components", {})
+    cached = rendered.get(slot)
+    if cached is None or cached[0] != fingerprint:
+        cached = rendered[slot] = (fingerprint, build())
+    st.markdown(cached[1], unsafe_allow_html=True)
 
 # =============================================================================
 # FUNÇÕES DE PROCESSAMENTO E ESTILIZAÇÃO
 # =============================================================================
-def row_has_valid_availability(row: pd.Series) -> bool:
-    for col in ["ECH", "EVZ", "RCH", "RVZ", "RCS"]:
-        if row.get(col, 0) > 0:
-            return True
-    return False
-
-def highlight_terminal_mod(row: pd.Series, terminal_value: str) -> list:
-    if terminal_value == "Multirio":
-        return ["background-color: #00397F; color: white"] * len(row)
-    elif terminal_value == "Rio Brasil Terminal":
-        return ["background-color: #F37529; color: white"] * len(row)
-    return [""] * len(row)
-
-def highlight_availability(val):
-    """
-    Retorna estilo para os valores de disponibilidade:
-      - >= 8: fundo verde e texto em negrito;
-      - 3 a 7: fundo amarelo;
-      - 0: fundo vermelho claro e texto acinzentado;
-      - Outros casos: fundo vermelho.
-    """
-    try:
-        val = int(val)
-        if val >= 8:
-            return 'background-color: rgba(76, 175, 80, 0.3); font-weight: bold;'
-        elif val >= 3:
-            return 'background-color: rgba(255, 193, 7, 0.3);'
-        elif val == 0:
-            return 'background-color: rgba(244, 67, 54, 0.2); color: #999;'
-        else:
-            return 'background-color: rgba(244, 67, 54, 0.3);'
-    except:
-        return ''
-
-def get_next_window(df: pd.DataFrame):
-    df_today = df[df["Data"] == today].copy()
-    if not df_today.empty:
-        df_today["Order"] = df_today.apply(lambda row: get_start_hour(row), axis=1)
-        df_today = df_today[df_today.apply(lambda row: current_hour < get_start_hour(row), axis=1)]
-        df_today.sort_values(by="Order", inplace=True, na_position="last")
-        if not df_today.empty:
-            return df_today.iloc[0]
+def get_next_window(unified_index: UnifiedIndex, terminal: str, now):
+    # Janela em andamento tem prioridade (inclusive a de ontem que atravessa a meia-noite); senão, a próxima a começar.
+    df_next = next_windows(unified_index.select_current(now.date(), [terminal]), now, n=1, include_open=True)
+    if not df_next.empty:
+        return df_next.iloc[0]
     return None
 
+def format_window_status(row: pd.Series) -> str:
+    return " (em andamento)" if row["status"] == STATUS_OPEN else ""
+
 def format_availability(row: pd.Series) -> str:
     return f"""
     Disponibilidade:
@@ -397,96 +278,59 @@ def format_availability(row: pd.Series) -> str:
 # =============================================================================
 # CRIAÇÃO DA SEÇÃO DE KPIs
 # =============================================================================
-# Agregados por terminal
-rio_aggregado = df_unified[df_unified["Terminal"] == "Rio Brasil Terminal"].copy()
-multirio_aggregado = df_unified[df_unified["Terminal"] == "Multirio"].copy()
-
-def create_kpi_section():
-    total_slots_today = len(df_unified[df_unified["Data"] == today])
-    total_availability = df_unified[df_unified["Data"] == today][["ECH", "EVZ", "RCH", "RVZ", "RCS"]].sum().sum()
-    rio_slots = len(rio_aggregado[rio_aggregado["Data"] == today])
-    multirio_slots = len(multirio_aggregado[multirio_aggregado["Data"] == today])
-    
-    kpi_html = f"""
-    <div style="display: flex; flex-wrap: wrap; gap: 15px; margin-bottom: 25px;">
-        <div style="flex: 1; min-width: 150px; background-color: white; padding: 15px; border-radius: 10px; box-shadow: 0 4px 12px rgba(0,0,0,0.1);">
-            <h4 style="margin: 0; color: #777; font-size: 14px;">Janelas Disponíveis Hoje</h4>
-            <p style="font-size: 28px; font-weight: bold; margin: 5px 0; color: #00397F;">{total_slots_today}</p>
-        </div>
-        <div style="flex: 1; min-width: 150px; background-color: white; padding: 15px; border-radius: 10px; box-shadow: 0 4px 12px rgba(0,0,0,0.1);">
-            <h4 style="margin: 0; color: #777; font-size: 14px;">Total Disponibilidade</h4>
-            <p style="font-size: 28px; font-weight: bold; margin: 5px 0; color: #F37529;">{int(total_availability)}</p>
-        </div>
-        <div style="flex: 1; min-width: 150px; background-color: white; padding: 15px; border-radius: 10px; box-shadow: 0 4px 12px rgba(0,0,0,0.1);">
-            <h4 style="margin: 0; color: #777; font-size: 14px;">Rio Brasil</h4>
-            <p style="font-size: 28px; font-weight: bold; margin: 5px 0; color: #F37529;">{rio_slots}</p>
-        </div>
+# Terminais selecionados no filtro, na ordem do registro.
+selected_terminals = [terminal for terminal in TERMINAL_REGISTRY if terminal in terminal_filter]
+
+if not selected_terminals:
+    st.info("Selecione ao menos um terminal no filtro da barra lateral.")
+    st.stop()
+
+def create_kpi_card(title: str, value, color: str) -> str:
+    return f"""
         <div style="flex: 1; min-width: 150px; background-color: white; padding: 15px; border-radius: 10px; box-shadow: 0 4px 12px rgba(0,0,0,0.1);">
-            <h4 style="margin: 0; color: #777; font-size: 14px;">Multirio</h4>
-            <p style="font-size: 28px; font-weight: bold; margin: 5px 0; color: #00397F;">{multirio_slots}</p>
-        </div>
+            <h4 style="margin: 0; color: #777; font-size: 14px;">{title}</h4>
+            <p style="font-size: 28px; font-weight: bold; margin: 5px 0; color: {color};">{value}</p>
+        </div>"""
+
+def create_kpi_section(unified_index: UnifiedIndex, today) -> str:
+    df_today = unified_index.select(today, selected_terminals)
+    total_slots_today = len(df_today)
+    total_availability = df_today["total_available"].sum()
+
+    cards = [
+        create_kpi_card("Janelas Disponíveis Hoje", total_slots_today, "#00397F"),
+        create_kpi_card("Total Disponibilidade", int(total_availability), "#F37529"),
+    ]
+    for terminal in selected_terminals:
+        adapter = TERMINAL_REGISTRY[terminal]
+        cards.append(create_kpi_card(adapter.label, len(unified_index.slice(today, terminal)), adapter.color))
+
+    return f"""
+    <div style="display: flex; flex-wrap: wrap; gap: 15px; margin-bottom: 25px;">{"".join(cards)}
     </div>
     """
-    st.markdown(kpi_html, unsafe_allow_html=True)
-
-create_kpi_section()
-
-# =============================================================================
-# IDENTIFICAÇÃO DAS PRÓXIMAS JANELAS
-# =============================================================================
-next_window_rio = get_next_window(rio_aggregado)
-next_window_multirio = get_next_window(multirio_aggregado)
 
 # =============================================================================
-# EXIBIÇÃO DOS ALERTAS (PRÓXIMAS JANELAS)
+# ALERTAS (PRÓXIMAS JANELAS)
 # =============================================================================
-col_alerts = st.columns(2)
-with col_alerts[0]:
-    if next_window_rio is not None:
-        availability_html_rio = format_availability(next_window_rio)
-        st.markdown(
-            f"""
-            <div class="card-alert card-rio">
-                <strong>Próxima janela disponível para Rio Brasil Terminal</strong>: {next_window_rio['Horário']}<br>
-                {availability_html_rio}
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
+def create_alert_card(terminal: str, next_window, terminal_errors: dict) -> str:
+    card_class = f"card-{TERMINAL_REGISTRY[terminal].css_slug}"
+    if next_window is not None:
+        content = f"""
+                <strong>Próxima janela disponível para {terminal}</strong>: {next_window['Horário']}{format_window_status(next_window)}<br>
+                {format_availability(next_window)}"""
+    elif terminal in terminal_errors:
+        content = f"Dados do {terminal} indisponíveis no momento."
     else:
-        st.markdown(
-            """
-            <div class="card-alert card-rio">
-                Não há janelas disponíveis para o restante do dia no Rio Brasil Terminal.
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
-
-with col_alerts[1]:
-    if next_window_multirio is not None:
-        availability_html_multi = format_availability(next_window_multirio)
-        st.markdown(
-            f"""
-            <div class="card-alert card-multirio">
-                <strong>Próxima janela disponível para Multirio</strong>: {next_window_multirio['Horário']}<br>
-                {availability_html_multi}
+        content = f"Não há janelas disponíveis para o restante do dia no {terminal}."
+    return f"""
+            <div class="card-alert {card_class}">
+                {content}
             </div>
-            """,
-            unsafe_allow_html=True
-        )
-    else:
-        st.markdown(
             """
-            <div class="card-alert card-multirio">
-                Não há janelas disponíveis para o restante do dia no Multirio.
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
 
 # =============================================================================
-# CABEÇALHO PARA OS DIAS (D, D+1, D+2)
+# CABEÇALHO PARA OS DIAS (D, D+1, ..., D+N)
 # =============================================================================
 def create_day_header(day_label, date_str):
     return f"""
@@ -496,50 +340,114 @@ def create_day_header(day_label, date_str):
     </div>
     """
 
-# =============================================================================
-# EXIBIÇÃO DAS TABELAS DIÁRIAS
-# =============================================================================
-days_list = [today, today + timedelta(days=1), today + timedelta(days=2)]
-table_titles = ["D", "D+1", "D+2"]
-
-cols = st.columns(3)
-for i, day in enumerate(days_list):
-    with cols[i]:
-        st.markdown(create_day_header(table_titles[i], day.strftime('%d/%m/%Y')), unsafe_allow_html=True)
-        df_day = df_unified[df_unified["Data"] == day].copy()
-        
-        # Para o dia atual, filtra janelas que ainda não iniciaram
-        if day == today:
-            df_day = df_day[df_day.apply(lambda row: current_hour < get_start_hour(row), axis=1)].copy()
-        
-        df_day = df_day[df_day.apply(row_has_valid_availability, axis=1)].copy()
-        
-        if not df_day.empty:
-            df_day["Order"] = df_day.apply(lambda row: get_start_hour(row), axis=1)
-            df_day.sort_values(by="Order", inplace=True, na_position="last")
-            df_day.drop(columns=["Order"], inplace=True, errors="ignore")
-        
-        terminal_series = df_day["Terminal"].reset_index(drop=True)
-        df_day_display = df_day.drop(columns=["Terminal", "Data"], errors="ignore").reset_index(drop=True)
-        
-        styled_data = df_day_display.style.apply(
-            lambda row: highlight_terminal_mod(row, terminal_series.iloc[row.name]),
-            axis=1
+horizon_days = list(range(horizon + 1))
+day_pages = [horizon_days[i:i + DAYS_PER_PAGE] for i in range(0, len(horizon_days), DAYS_PER_PAGE)]
+
+def day_label(offset: int) -> str:
+    return "D" if offset == 0 else f"D+{offset}"
+
+# =============================================================================
+# PAINEL COM ATUALIZAÇÃO AUTOMÁTICA
+# =============================================================================
+# A cada REFRESH_SECONDS só este fragmento roda de novo (CSS, título e sidebar
+# ficam como estão). As fontes são reconsultadas pelo cache/snapshot e cada
+# componente só é reconstruído se os dados que ele mostra mudaram.
+@st.fragment(run_every=REFRESH_SECONDS or None)
+def live_dashboard():
+    with st.spinner('Carregando dados das janelas...'):
+        try:
+            source_data = get_source().load()
+        except Exception as e:
+            st.error(f"Erro ao carregar os dados das planilhas: {e}")
+            return
+    unified_index = source_data.unified_index
+    terminal_errors = source_data.errors
+    data_version = source_data.version
+
+    if unified_index is None:
+        st.error(f"Erro ao carregar os dados das planilhas: {'; '.join(terminal_errors.values())}")
+        return
+
+    for terminal, error in terminal_errors.items():
+        st.warning(f"Dados do terminal {terminal} indisponíveis: {error}", icon="⚠️")
+    if not terminal_errors:
+        st.success('Dados carregados com sucesso!', icon="✅")
+
+    # Status das janelas calculado no horário atual (sempre no fuso do porto).
+    now = now_local()
+    today = now.date()
+    unified_index = unified_index.with_columns(status=window_status(unified_index.df, now))
+
+    render_if_changed(
+        "kpis",
+        (data_version, tuple(selected_terminals), today),
+        lambda: create_kpi_section(unified_index, today),
+    )
+
+    col_alerts = st.columns(len(selected_terminals))
+    for col_alert, terminal in zip(col_alerts, selected_terminals):
+        next_window = get_next_window(unified_index, terminal, now)
+        window_key = None if next_window is None else (next_window.name, next_window["status"])
+        with col_alert:
+            render_if_changed(
+                f"alerta-{terminal}",
+                (data_version, window_key, terminal in terminal_errors),
+                lambda: create_alert_card(terminal, next_window, terminal_errors),
+            )
+
+    # Só os dias da página escolhida são filtrados e renderizados neste ciclo.
+    page = 0
+    if len(day_pages) > 1:
+        page = st.radio(
+            "Dias exibidos:",
+            options=range(len(day_pages)),
+            format_func=lambda p: " a ".join(dict.fromkeys([day_label(day_pages[p][0]), day_label(day_pages[p][-1])])),
+            horizontal=True,
+            key="day_page",
         )
-        # Aplica o estilo de disponibilidade nos valores numéricos
-        styled_data = styled_data.applymap(highlight_availability, subset=["ECH", "EVZ", "RCH", "RVZ", "RCS"])
-        
-        display_cols = ["Horário", "ECH", "EVZ", "RCH", "RVZ", "RCS"]
-        df_day_display = df_day_display[[c for c in display_cols if c in df_day_display.columns]]
-        df_day_display.reset_index(drop=True, inplace=True)
-        
-        num_cols = df_day_display.select_dtypes(include=["number"]).columns
-        styled_data = styled_data.format("{:.0f}", subset=num_cols)
-        
-        if df_day_display.empty:
-            st.write("Sem janelas disponíveis.")
-        else:
-            st.dataframe(styled_data, use_container_width=True, hide_index=True)
+        page = min(page, len(day_pages) - 1)
+
+    cols = st.columns(DAYS_PER_PAGE)
+    for i, offset in enumerate(day_pages[page]):
+        day = today + timedelta(days=offset)
+        with cols[i]:
+            st.markdown(create_day_header(day_label(offset), day.strftime('%d/%m/%Y')), unsafe_allow_html=True)
+            # Para o dia atual, entram as janelas de ontem que atravessam a meia-noite e as
+            # já encerradas saem (as em andamento continuam visíveis, as de ontem no topo).
+            if day == today:
+                df_day = unified_index.select_current(day, selected_terminals)
+                df_day = df_day[df_day["status"] != STATUS_CLOSED]
+                from_today = (df_day["Data"] == pd.Timestamp(day)).to_numpy()
+                df_day = df_day.assign(_hoje=from_today).sort_values(
+                    by=["_hoje", "start_minute"], na_position="last", kind="stable"
+                ).drop(columns="_hoje")
+            else:
+                df_day = unified_index.select(day, selected_terminals).sort_values(by="start_minute", na_position="last")
+
+            df_day = df_day[df_day["has_availability"]]
+
+            if df_day.empty:
+                st.write("Sem janelas disponíveis.")
+            else:
+                # As linhas exibidas mudam com os dados ou quando uma janela de hoje se encerra.
+                render_if_changed(
+                    f"dia-{offset}",
+                    (data_version, day, tuple(df_day.index)),
+                    lambda: build_day_table_html(df_day),
+                )
+
+    source_times = format_source_times(source_data.revisions)
+    st.markdown(
+        f"""
+        <div style="text-align: right; font-size: 12px; color: #777; margin-top: 30px;">
+            {f"Dados das fontes: {source_times}<br>" if source_times else ""}
+            Última verificação: {now.strftime('%d/%m/%Y %H:%M:%S')}
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
+
+live_dashboard()
 
 # =============================================================================
 # LEGENDA COM ÍCONES
@@ -567,20 +475,38 @@ legend_html_improved = """
 st.markdown("---")
 st.markdown(
     "<b>Legenda - Terminais:</b><br>"
-    "<span style='background-color:#00397F; color:white; padding:4px 8px; border-radius:4px;'>Multirio</span>&nbsp;&nbsp;"
-    "<span style='background-color:#F37529; color:white; padding:4px 8px; border-radius:4px;'>Rio Brasil Terminal</span>",
+    + "&nbsp;&nbsp;".join(
+        f"<span style='background-color:{adapter.color}; color:white; padding:4px 8px; border-radius:4px;'>{terminal}</span>"
+        for terminal, adapter in TERMINAL_REGISTRY.items()
+    ),
     unsafe_allow_html=True
 )
 st.markdown(legend_html_improved, unsafe_allow_html=True)
 
 # =============================================================================
-# HORA DA ÚLTIMA ATUALIZAÇÃO
+# PAINEL DE DESEMPENHO (ADMINISTRAÇÃO)
 # =============================================================================
-st.markdown(
-    f"""
-    <div style="text-align: right; font-size: 12px; color: #777; margin-top: 30px;">
-        Última atualização: {datetime.datetime.now().strftime('%d/%m/%Y %H:%M:%S')}
-    </div>
-    """,
-    unsafe_allow_html=True,
-)
+def metrics_frame(rows: list) -> pd.DataFrame:
+    # Rótulos com file_id aparecem com o nome do terminal correspondente.
+    terminal_by_file = {adapter.file_id: terminal for terminal, adapter in TERMINAL_REGISTRY.items()}
+    df = pd.DataFrame(rows)
+    if not df.empty:
+        df["rotulo"] = df["rotulo"].map(lambda label: terminal_by_file.get(label, label))
+    return df
+
+if ADMIN_PANEL or st.query_params.get("admin") == "1":
+    with st.sidebar.expander("Desempenho", expanded=True):
+        df_stages = metrics_frame(metricas.METRICS.stages())
+        if df_stages.empty:
+            st.write("Nenhuma etapa medida ainda.")
+        else:
+            st.dataframe(
+                df_stages[["etapa", "rotulo", "count", "last_ms", "media_ms", "max_ms", "bytes"]].round(1),
+                hide_index=True,
+            )
+        df_counters = metrics_frame(metricas.METRICS.counters())
+        if not df_counters.empty:
+            st.dataframe(df_counters, hide_index=True)
+        if st.button("Zerar métricas", key="reset_metrics"):
+            metricas.METRICS.reset()
+            st.rerun()
@@ -0,0 +1,57 @@
+"""
+Benchmark da interpretação de Horário: apply por linha (get_start_hour /
+get_end_hour, caminho antigo) contra parse_window_minutes vetorizado.
+
+Uso:
+    python benchmarks/bench_horarios.py --rows 100000
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from comum import print_speedup, timed, window_labels
+from janelas.horarios import parse_window_minutes
+
+
+def get_end_hour(row: pd.Series):
+    try:
+        parts = row["Horário"].split(" - ")
+        end_str = parts[1]
+        return int(end_str.split(":")[0])
+    except:
+        return None
+
+
+def get_start_hour(row: pd.Series):
+    try:
+        parts = row["Horário"].split(" - ")
+        start_str = parts[0]
+        return int(start_str.split(":")[0])
+    except:
+        return None
+
+
+def build_frame(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(42)
+    return pd.DataFrame({"Horário": rng.choice(window_labels(48), rows)})
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = build_frame(args.rows)
+    print(f"{args.rows} linhas")
+    baseline = timed(
+        "apply por linha (início + fim)",
+        lambda: (df.apply(get_start_hour, axis=1), df.apply(get_end_hour, axis=1)),
+        args.repeat,
+    )
+    print_speedup(baseline, timed("parse_window_minutes", lambda: parse_window_minutes(df["Horário"]), args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark do parse das planilhas: caminho atual (read_excel de todas as colunas)
+contra os caminhos rápidos (CSV exportado e XLSX com usecols/dtype).
+
+Uso:
+    python benchmarks/bench_parse.py --days 200
+"""
+import io
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from comum import build_rio_brasil, print_speedup, timed
+
+RIO_BRASIL_USECOLS = ["DATA", "HORA", "DESCRICAO", "DISPONÍVEL", "RESERVADA"]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=200)
+    parser.add_argument("--windows-per-day", type=int, default=48)
+    parser.add_argument("--extra-cols", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = build_rio_brasil(args.days, args.windows_per_day, np.random.default_rng(42), args.extra_cols)
+    xlsx_bytes = io.BytesIO()
+    df.to_excel(xlsx_bytes, index=False)
+    csv_bytes = df.to_csv(index=False).encode()
+    wanted = set(RIO_BRASIL_USECOLS)
+    dtype = {"HORA": str, "DESCRICAO": str}
+
+    print(f"{len(df)} linhas, {len(df.columns)} colunas")
+    baseline = timed(
+        "read_excel (todas as colunas, atual)",
+        lambda: pd.read_excel(io.BytesIO(xlsx_bytes.getvalue())),
+        args.repeat,
+    )
+    candidates = {
+        "read_excel usecols/dtype (openpyxl)": lambda: pd.read_excel(
+            io.BytesIO(xlsx_bytes.getvalue()), usecols=lambda c: c in wanted, dtype=dtype, engine="openpyxl"
+        ),
+        "read_csv usecols/dtype (exportação CSV)": lambda: pd.read_csv(
+            io.BytesIO(csv_bytes), usecols=lambda c: c in wanted, dtype=dtype
+        ),
+    }
+    try:
+        import python_calamine  # noqa: F401
+        candidates["read_excel usecols/dtype (calamine)"] = lambda: pd.read_excel(
+            io.BytesIO(xlsx_bytes.getvalue()), usecols=lambda c: c in wanted, dtype=dtype, engine="calamine"
+        )
+    except ImportError:
+        pass
+    for label, fn in candidates.items():
+        print_speedup(baseline, timed(label, fn, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
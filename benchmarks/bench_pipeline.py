@@ -0,0 +1,168 @@
+"""
+Benchmark offline do pipeline completo com planilhas sintéticas.
+
+Gera planilhas no formato da Multirio (Data, JANELAS MULTIRIO, colunas
+"... Disp.") e do Rio Brasil Terminal (DATA, HORA, DESCRICAO, DISPONÍVEL,
+RESERVADA) em várias escalas, serve-as por um substituto local de
+fetch_spreadsheet/load_spreadsheet (sem acesso ao Drive) e mede as etapas de
+carregamento, parse, normalização, unificação, índice, próxima janela e
+montagem das tabelas. O resultado é gravado em JSON para comparar versões.
+
+Uso:
+    python benchmarks/bench_pipeline.py --days 7 30 90 --output resultado.json
+    python benchmarks/bench_pipeline.py --days 30 --compare resultado.json
+"""
+import io
+import json
+import hashlib
+import argparse
+import datetime
+import platform
+import subprocess
+
+import numpy as np
+import pandas as pd
+
+from comum import ROOT, START_DATE, build_multirio, build_rio_brasil, measure
+from janelas.drive import parse_spreadsheet
+from janelas.horarios import next_windows, window_status
+from janelas.indice import UnifiedIndex
+from janelas.pipeline import load_terminals_parallel, unify_terminals
+from janelas.tabelas import build_day_table_html
+from janelas.terminais import TERMINAL_REGISTRY
+
+# Instante de referência para status/próxima janela: meio do primeiro dia.
+NOW = datetime.datetime(2025, 1, 1, 10, 0)
+HORIZON_DAYS = 3
+
+
+class LocalWorkbooks:
+    """
+    Substituto local de fetch_spreadsheet/load_spreadsheet: serve planilhas
+    geradas em memória (XLSX ou CSV) com a mesma assinatura, sem Drive.
+    """
+
+    def __init__(self, frames: dict, file_format: str):
+        self.file_format = file_format
+        self._files = {}
+        for file_id, df in frames.items():
+            buffer = io.BytesIO()
+            if file_format == "csv":
+                df.to_csv(buffer, index=False)
+            else:
+                df.to_excel(buffer, index=False)
+            content = buffer.getvalue()
+            self._files[file_id] = (content, ("local", hashlib.md5(content).hexdigest(), "1"))
+
+    def size(self, file_id: str) -> int:
+        return len(self._files[file_id][0])
+
+    def fetch(self, file_id: str, sheet_name=0, known_revision=None, usecols=None, dtype=None):
+        content, revision = self._files[file_id]
+        if known_revision is not None and revision == known_revision:
+            return None, revision
+        df = parse_spreadsheet(io.BytesIO(content), self.file_format, sheet_name=sheet_name, usecols=usecols, dtype=dtype)
+        return df, revision
+
+    def load(self, file_id: str, sheet_name=0, usecols=None, dtype=None) -> pd.DataFrame:
+        df, _ = self.fetch(file_id, sheet_name, usecols=usecols, dtype=dtype)
+        return df
+
+
+def run_scale(days: int, windows_per_day: int, file_format: str, repeat: int) -> dict:
+    rng = np.random.default_rng(42)
+    builders = {"Multirio": build_multirio, "Rio Brasil Terminal": build_rio_brasil}
+    adapters = {terminal: TERMINAL_REGISTRY[terminal] for terminal in builders}
+    workbooks = LocalWorkbooks(
+        {adapter.file_id: builders[terminal](days, windows_per_day, rng) for terminal, adapter in adapters.items()},
+        file_format,
+    )
+
+    def load(adapter):
+        return workbooks.load(adapter.file_id, usecols=adapter.usecols, dtype=adapter.dtype)
+
+    raw = {terminal: load(adapter) for terminal, adapter in adapters.items()}
+    df_unified = unify_terminals(raw, {}, adapters)
+    unified_index = UnifiedIndex(df_unified)
+    status_index = unified_index.with_columns(status=window_status(unified_index.df, NOW))
+    days_shown = [START_DATE + datetime.timedelta(days=offset) for offset in range(HORIZON_DAYS)]
+
+    stages = {}
+    stages["carregamento"] = measure(
+        lambda: load_terminals_parallel({t: (lambda a=a: load(a)) for t, a in adapters.items()}), repeat
+    )
+    for terminal, adapter in adapters.items():
+        stages[f"parse[{terminal}]"] = measure(lambda: load(adapter), repeat)
+        stages[f"normalizacao[{terminal}]"] = measure(lambda: adapter.to_unified(raw[terminal]), repeat)
+    stages["unificacao"] = measure(lambda: unify_terminals(raw, {}, adapters), repeat)
+    stages["indice"] = measure(lambda: UnifiedIndex(df_unified), repeat)
+    stages["status"] = measure(lambda: window_status(unified_index.df, NOW), repeat)
+    stages["proxima_janela"] = measure(
+        lambda: [next_windows(status_index.slice(NOW.date(), t), NOW, n=1, include_open=True) for t in adapters],
+        repeat,
+    )
+    stages["tabelas"] = measure(
+        lambda: [build_day_table_html(status_index.select(day, list(adapters))) for day in days_shown], repeat
+    )
+    return {
+        "dias": days,
+        "janelas_por_dia": windows_per_day,
+        "linhas": {terminal: len(df) for terminal, df in raw.items()},
+        "bytes": {terminal: workbooks.size(adapter.file_id) for terminal, adapter in adapters.items()},
+        "linhas_unificadas": len(df_unified),
+        "etapas": stages,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results: dict, baseline: dict = None):
+    baseline_scales = {(s["dias"], s["janelas_por_dia"]): s for s in (baseline or {}).get("escalas", [])}
+    for scale in results["escalas"]:
+        print(f"\n{scale['dias']} dias x {scale['janelas_por_dia']} janelas: {scale['linhas']}")
+        previous = baseline_scales.get((scale["dias"], scale["janelas_por_dia"]), {}).get("etapas", {})
+        for stage, timing in scale["etapas"].items():
+            line = f"  {stage:<40} {timing['melhor_ms']:10.2f} ms"
+            if stage in previous and timing["melhor_ms"]:
+                line += f"   {previous[stage]['melhor_ms'] / timing['melhor_ms']:6.2f}x vs {baseline.get('versao')}"
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, nargs="+", default=[7, 30, 90])
+    parser.add_argument("--windows-per-day", type=int, default=48)
+    parser.add_argument("--format", choices=["xlsx", "csv"], default="xlsx")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="arquivo JSON onde gravar os resultados")
+    parser.add_argument("--compare", help="JSON de uma execução anterior para comparar")
+    args = parser.parse_args()
+
+    results = {
+        "versao": git_revision(),
+        "gerado_em": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "formato": args.format,
+        "escalas": [run_scale(days, args.windows_per_day, args.format, args.repeat) for days in args.days],
+    }
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"\nResultados gravados em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
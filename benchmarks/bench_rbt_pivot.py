@@ -0,0 +1,58 @@
+"""
+Benchmark da normalização da planilha do Rio Brasil Terminal: laço de máscaras
+por DESCRICAO + .loc (caminho antigo) contra o groupby/unstack categórico de
+normalize_rio_brasil. Mede tempo e pico de memória (tracemalloc).
+
+Uso:
+    python benchmarks/bench_rbt_pivot.py --days 60
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from comum import build_rio_brasil, print_speedup, timed
+from janelas.terminais import desc_to_col, normalize_rio_brasil
+
+
+def normalize_rio_brasil_loop(df_info: pd.DataFrame) -> pd.DataFrame:
+    df_info_renamed = df_info.copy()
+    df_info_renamed.rename(columns={"DATA": "Data", "HORA": "Horário"}, inplace=True)
+
+    for col in ["DISPONÍVEL", "RESERVADA"]:
+        df_info_renamed[col] = pd.to_numeric(df_info_renamed[col], errors="coerce").fillna(0)
+
+    df_info_renamed["ECH"] = 0
+    df_info_renamed["EVZ"] = 0
+    df_info_renamed["RCH"] = 0
+    df_info_renamed["RVZ"] = 0
+    df_info_renamed["RCS"] = 0
+
+    for desc, col_alvo in desc_to_col.items():
+        mask = df_info_renamed["DESCRICAO"] == desc
+        df_info_renamed.loc[mask, col_alvo] = df_info_renamed.loc[mask, "DISPONÍVEL"] - df_info_renamed.loc[mask, "RESERVADA"]
+
+    df_info_renamed["Terminal"] = "Rio Brasil Terminal"
+    df_info_renamed["Data"] = pd.to_datetime(df_info_renamed["Data"], errors="coerce", dayfirst=True).dt.date
+
+    df_info_unified = df_info_renamed[["Data", "Horário", "ECH", "EVZ", "RCH", "RVZ", "RCS", "Terminal"]].copy()
+    # O laço gera uma linha por descrição; o groupby do pipeline é que as juntava.
+    return df_info_unified.groupby(["Data", "Horário", "Terminal"], as_index=False).sum()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=60)
+    parser.add_argument("--windows-per-day", type=int, default=48)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = build_rio_brasil(args.days, args.windows_per_day, np.random.default_rng(42))
+    print(f"{len(df)} linhas ({args.days} dias)")
+    baseline = timed("máscara por descrição + groupby", lambda: normalize_rio_brasil_loop(df), args.repeat, memory=True)
+    pivot = timed("categórico + groupby/unstack", lambda: normalize_rio_brasil(df), args.repeat, memory=True)
+    print_speedup(baseline, pivot)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Benchmark dos tipos do frame unificado: colunas object/int64 com datas como
+datetime.date (esquema antigo) contra os tipos compactos de
+enforce_unified_schema. Mede memória (memory_usage deep) e o tempo de montar o
+UnifiedIndex e de filtrar um dia por comparação de Data.
+
+Uso:
+    python benchmarks/bench_schema.py --days 60
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from comum import build_unified, timed
+from janelas.horarios import add_window_columns
+from janelas.indice import UnifiedIndex, sort_unified
+from janelas.pipeline import add_availability_columns
+from janelas.terminais import enforce_unified_schema
+
+
+def run(label: str, df: pd.DataFrame, day, repeat: int):
+    df = sort_unified(add_availability_columns(add_window_columns(df)))
+    print(f"{label}: {df.memory_usage(deep=True).sum() / 2**20:.1f} MiB")
+    timed("  UnifiedIndex", lambda: UnifiedIndex(df), repeat)
+    timed("  filtro Data == dia", lambda: df[df["Data"] == day], repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=60)
+    parser.add_argument("--windows-per-day", type=int, default=48)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    df = build_unified(args.days, args.windows_per_day, np.random.default_rng(42))
+    day = df["Data"].iloc[len(df) // 2]
+    print(f"{len(df)} linhas ({args.days} dias)")
+    run("object/int64", df, day, args.repeat)
+    run("compacto", enforce_unified_schema(df), pd.Timestamp(day), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark da renderização das tabelas diárias: Styler do pandas (apply por
+linha + applymap por célula, caminho antigo) contra o HTML pré-montado de
+janelas/tabelas.py, para horizontes de 3 e 14 dias.
+
+O custo do Styler é medido até a geração do HTML (Styler.to_html), que é a
+mesma tradução célula a célula feita antes de serializar para o st.dataframe.
+
+Uso:
+    python benchmarks/bench_tabelas.py --windows-per-day 48
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from comum import build_unified, print_speedup, timed
+from janelas.tabelas import build_day_table_html
+from janelas.terminais import AVAILABILITY_COLS
+
+
+def highlight_terminal_mod(row: pd.Series, terminal_value: str) -> list:
+    if terminal_value == "Multirio":
+        return ["background-color: #00397F; color: white"] * len(row)
+    elif terminal_value == "Rio Brasil Terminal":
+        return ["background-color: #F37529; color: white"] * len(row)
+    return [""] * len(row)
+
+
+def highlight_availability(val):
+    try:
+        val = int(val)
+        if val >= 8:
+            return 'background-color: rgba(76, 175, 80, 0.3); font-weight: bold;'
+        elif val >= 3:
+            return 'background-color: rgba(255, 193, 7, 0.3);'
+        elif val == 0:
+            return 'background-color: rgba(244, 67, 54, 0.2); color: #999;'
+        else:
+            return 'background-color: rgba(244, 67, 54, 0.3);'
+    except:
+        return ''
+
+
+def styler_table(df_day: pd.DataFrame) -> str:
+    terminal_series = df_day["Terminal"].reset_index(drop=True)
+    df_day_display = df_day[["Horário"] + AVAILABILITY_COLS].reset_index(drop=True)
+    styled_data = df_day_display.style.apply(
+        lambda row: highlight_terminal_mod(row, terminal_series.iloc[row.name]),
+        axis=1
+    )
+    # applymap foi renomeado para map no pandas 2.1.
+    cell_map = getattr(styled_data, "map", None) or styled_data.applymap
+    styled_data = cell_map(highlight_availability, subset=AVAILABILITY_COLS)
+    styled_data = styled_data.format("{:.0f}", subset=AVAILABILITY_COLS)
+    return styled_data.to_html()
+
+
+def build_days(days: int, windows_per_day: int) -> list:
+    df = build_unified(days, windows_per_day, np.random.default_rng(42))
+    return [df_day.reset_index(drop=True) for _, df_day in df.groupby("Data", sort=True)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--windows-per-day", type=int, default=48)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for days in (3, 14):
+        frames = build_days(days, args.windows_per_day)
+        print(f"Horizonte de {days} dias ({args.windows_per_day * 2} linhas por dia)")
+        baseline = timed("  Styler (apply + applymap)", lambda: [styler_table(df) for df in frames], args.repeat)
+        print_speedup(baseline, timed("  HTML pré-montado", lambda: [build_day_table_html(df) for df in frames], args.repeat))
+
+
+if __name__ == "__main__":
+    main()
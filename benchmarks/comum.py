@@ -0,0 +1,110 @@
+"""
+Geradores de planilhas sintéticas e medição de tempo compartilhados pelos
+benchmarks. Importar este módulo coloca a raiz do repositório no sys.path,
+para que os scripts (python benchmarks/bench_*.py) importem o pacote janelas.
+"""
+import os
+import sys
+import time
+import datetime
+import statistics
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from janelas.terminais import AVAILABILITY_COLS, desc_to_col, disp_cols  # noqa: E402
+
+START_DATE = datetime.date(2025, 1, 1)
+TERMINALS = ["Multirio", "Rio Brasil Terminal"]
+# Largura do rótulo nas linhas impressas por `timed`.
+LABEL_WIDTH = 45
+
+
+def window_labels(windows_per_day: int) -> list:
+    """Horários ("HH:MM - HH:MM") de `windows_per_day` janelas que cobrem o dia."""
+    step = 1440 // windows_per_day
+    return [
+        f"{m // 60:02d}:{m % 60:02d} - {(m + step) // 60 % 24:02d}:{(m + step) % 60:02d}"
+        for m in np.arange(windows_per_day) * step
+    ]
+
+
+def build_multirio(days: int, windows_per_day: int, rng) -> pd.DataFrame:
+    """Planilha no formato da Multirio (Data, JANELAS MULTIRIO, colunas "... Disp.")."""
+    dates = pd.date_range(START_DATE, periods=days).strftime("%d/%m/%Y")
+    index = pd.MultiIndex.from_product([dates, window_labels(windows_per_day)], names=["Data", "JANELAS MULTIRIO"])
+    df = index.to_frame(index=False)
+    for col in disp_cols:
+        df[col] = rng.integers(0, 12, len(df))
+    # Colunas que existem na planilha real mas não são usadas pelo dashboard.
+    df["OBSERVAÇÃO"] = "-"
+    return df
+
+
+def build_rio_brasil(days: int, windows_per_day: int, rng, extra_cols: int = 0) -> pd.DataFrame:
+    """
+    Planilha no formato do Rio Brasil Terminal (DATA, HORA, DESCRICAO,
+    DISPONÍVEL, RESERVADA), com `extra_cols` colunas numéricas não usadas.
+    """
+    dates = pd.date_range(START_DATE, periods=days).strftime("%d/%m/%Y")
+    index = pd.MultiIndex.from_product(
+        [dates, window_labels(windows_per_day), list(desc_to_col)], names=["DATA", "HORA", "DESCRICAO"]
+    )
+    df = index.to_frame(index=False)
+    df["DISPONÍVEL"] = rng.integers(0, 40, len(df))
+    df["RESERVADA"] = rng.integers(0, 20, len(df))
+    df["CAPACIDADE"] = df["DISPONÍVEL"] + df["RESERVADA"]
+    for i in range(extra_cols):
+        df[f"EXTRA {i}"] = rng.integers(0, 1000, len(df))
+    return df
+
+
+def build_unified(days: int, windows_per_day: int, rng) -> pd.DataFrame:
+    """Frame unificado no esquema antigo: Data como datetime.date, colunas object/int64."""
+    dates = pd.date_range(START_DATE, periods=days).date
+    index = pd.MultiIndex.from_product(
+        [dates, window_labels(windows_per_day), TERMINALS], names=["Data", "Horário", "Terminal"]
+    )
+    df = index.to_frame(index=False)
+    for col in AVAILABILITY_COLS:
+        df[col] = rng.integers(-5, 40, len(df))
+    return df
+
+
+def measure(fn, repeat: int) -> dict:
+    """Executa `fn` `repeat` vezes e retorna o melhor tempo e a mediana, em ms."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"melhor_ms": round(min(samples), 3), "mediana_ms": round(statistics.median(samples), 3)}
+
+
+def peak_memory_mib(fn) -> float:
+    """Pico de memória alocada (tracemalloc) durante uma execução de `fn`, em MiB."""
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 2**20
+
+
+def timed(label: str, fn, repeat: int, memory: bool = False) -> float:
+    """Imprime o melhor tempo de `fn` (e o pico de memória, com `memory`) e o retorna em ms."""
+    best = measure(fn, repeat)["melhor_ms"]
+    line = f"{label:<{LABEL_WIDTH}} {best:10.1f} ms"
+    if memory:
+        line += f" {peak_memory_mib(fn):10.1f} MiB pico"
+    print(line)
+    return best
+
+
+def print_speedup(baseline: float, elapsed: float):
+    print(f"{'':<{LABEL_WIDTH}} {baseline / elapsed:10.1f}x")
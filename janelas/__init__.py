@@ -0,0 +1,3 @@
+"""
+Pipeline de dados do Dashboard de Janelas (Drive, normalização e snapshots).
+"""
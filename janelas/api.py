@@ -0,0 +1,218 @@
+"""
+API HTTP somente leitura com a disponibilidade das janelas, para sistemas que
+hoje raspam o dashboard.
+
+Roda como processo separado (python -m janelas.api) sobre o mesmo
+DashboardSource do app: com JANELAS_SNAPSHOT_DIR (ou --snapshot-dir), lê o
+snapshot gravado pela ingestão e nunca acessa o Drive. As respostas ficam em
+memória, indexadas pela versão dos dados, e levam um ETag; um If-None-Match
+igual recebe 304 sem corpo.
+
+Rotas (GET):
+    /janelas?data=AAAA-MM-DD&terminal=...&operacao=ECH   janelas com disponibilidade
+    /janelas?status=open&terminal=...                    janelas abertas agora (inclui as da véspera
+                                                         que atravessam a meia-noite)
+    /proxima?terminal=...&operacao=ECH                   próxima janela de cada terminal
+    /saude                                               versão e erros das fontes
+
+`terminal` pode ser repetido. O formato é JSON, ou Arrow IPC (stream) com
+`?formato=arrow` ou `Accept: application/vnd.apache.arrow.stream`.
+"""
+import io
+import json
+import time
+import hashlib
+import logging
+import argparse
+import datetime
+import threading
+import collections
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+from janelas.fonte import DashboardSource
+from janelas.horarios import STATUS_OPEN, next_windows, now_local, open_windows
+from janelas.snapshot import SNAPSHOT_DIR
+from janelas.terminais import AVAILABILITY_COLS, load_terminal_plugins
+
+logger = logging.getLogger(__name__)
+
+ARROW_MIME = "application/vnd.apache.arrow.stream"
+JSON_MIME = "application/json; charset=utf-8"
+# Intervalo mínimo (em segundos) entre consultas à fonte; nesse meio-tempo as respostas saem da memória.
+SOURCE_REFRESH_SECONDS = 5
+# Máximo de respostas prontas mantidas em memória.
+RESPONSE_CACHE_SIZE = 512
+RESPONSE_COLS = ["Data", "Horário", "Terminal"] + AVAILABILITY_COLS + ["total_available"]
+
+class APIError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+class AvailabilityAPI:
+    """
+    Lógica da API, independente do servidor HTTP: `handle` recebe o caminho,
+    a query string e os cabeçalhos relevantes e devolve (status, cabeçalhos, corpo).
+    """
+
+    def __init__(self, source: DashboardSource):
+        self.source = source
+        self._lock = threading.Lock()
+        self._source_data = None
+        self._loaded_at = float("-inf")
+        self._responses = collections.OrderedDict()  # chave -> (etag, content-type, corpo)
+
+    def _current(self):
+        with self._lock:
+            if time.monotonic() - self._loaded_at >= SOURCE_REFRESH_SECONDS:
+                self._source_data = self.source.load()
+                self._loaded_at = time.monotonic()
+            return self._source_data
+
+    def handle(self, path: str, query: str, accept: str = "", if_none_match: str = None):
+        try:
+            params = parse_qs(query)
+            file_format = "arrow" if params.get("formato") == ["arrow"] or ARROW_MIME in (accept or "") else "json"
+            source_data = self._current()
+            if path == "/saude":
+                body = json.dumps({
+                    "disponivel": source_data.unified_index is not None,
+                    "erros": source_data.errors,
+                    "revisoes": {terminal: list(rev) for terminal, rev in source_data.revisions.items()},
+                }, ensure_ascii=False).encode()
+                return 200, {"Content-Type": JSON_MIME, "Cache-Control": "no-cache"}, body
+            if path not in ("/janelas", "/proxima"):
+                raise APIError(404, f"rota desconhecida: {path}")
+            if source_data.unified_index is None:
+                raise APIError(503, "dados indisponíveis: " + "; ".join(source_data.errors.values()))
+
+            now = now_local()
+            # A próxima janela e as janelas abertas mudam com o relógio; as demais respostas, só com os dados.
+            clock = now.strftime("%Y%m%d%H%M") if path == "/proxima" or "status" in params else None
+            key = (repr(source_data.version), path, tuple(sorted((k, tuple(v)) for k, v in params.items())), file_format, clock)
+            with self._lock:
+                cached = self._responses.get(key)
+                if cached is not None:
+                    self._responses.move_to_end(key)
+            if cached is None:
+                if path == "/janelas":
+                    df = self._janelas(source_data.unified_index, params, now)
+                else:
+                    df = self._proxima(source_data.unified_index, params, now)
+                content_type, body = _encode(df, file_format)
+                cached = ('"' + hashlib.sha1(body).hexdigest() + '"', content_type, body)
+                with self._lock:
+                    self._responses[key] = cached
+                    while len(self._responses) > RESPONSE_CACHE_SIZE:
+                        self._responses.popitem(last=False)
+            etag, content_type, body = cached
+            headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept"}
+            if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+                return 304, headers, b""
+            return 200, dict(headers, **{"Content-Type": content_type}), body
+        except APIError as e:
+            return e.status, {"Content-Type": JSON_MIME}, json.dumps({"erro": str(e)}, ensure_ascii=False).encode()
+        except Exception:
+            # Snapshot ilegível, erro do pandas etc.: o cliente recebe um 500 em vez de conexão encerrada.
+            logger.exception("Erro ao responder %s?%s", path, query)
+            return 500, {"Content-Type": JSON_MIME}, json.dumps({"erro": "erro interno"}, ensure_ascii=False).encode()
+
+    def _filter(self, unified_index, params: dict, current: bool = False) -> pd.DataFrame:
+        # Com `current`, o dia pedido inclui as janelas da véspera que atravessam a meia-noite.
+        terminals = params.get("terminal")
+        if "data" in params:
+            try:
+                data = datetime.date.fromisoformat(params["data"][0])
+            except ValueError:
+                raise APIError(400, "data deve estar no formato AAAA-MM-DD")
+            if current:
+                df = unified_index.select_current(data, terminals)
+            else:
+                df = unified_index.select(data, terminals or unified_index.terminals(data))
+        else:
+            df = unified_index.df
+            if terminals:
+                df = df[df["Terminal"].isin(terminals)]
+        operation = params.get("operacao", [None])[0]
+        if operation is None:
+            return df[df["has_availability"]]
+        if operation not in AVAILABILITY_COLS:
+            raise APIError(400, f"operacao deve ser uma de: {', '.join(AVAILABILITY_COLS)}")
+        return df[df[operation] > 0]
+
+    def _janelas(self, unified_index, params: dict, now) -> pd.DataFrame:
+        status = params.get("status", [None])[0]
+        if status is None:
+            return self._filter(unified_index, params)[RESPONSE_COLS]
+        if status != STATUS_OPEN:
+            raise APIError(400, f"status deve ser {STATUS_OPEN}")
+        # Janelas abertas são sempre as de agora: `data` é ignorado.
+        df = self._filter(unified_index, dict(params, data=[now.date().isoformat()]), current=True)
+        return open_windows(df, now)[RESPONSE_COLS]
+
+    def _proxima(self, unified_index, params: dict, now) -> pd.DataFrame:
+        df = self._filter(unified_index, dict(params, data=[now.date().isoformat()]), current=True)
+        frames = [
+            next_windows(df_terminal, now, n=1, include_open=True)
+            for _, df_terminal in df.groupby("Terminal", observed=True, sort=False)
+        ]
+        if not frames:
+            return df.iloc[0:0][RESPONSE_COLS].assign(status=pd.Series(dtype=str))
+        return pd.concat(frames)[RESPONSE_COLS + ["status"]]
+
+def _encode(df: pd.DataFrame, file_format: str):
+    if file_format == "arrow":
+        import pyarrow as pa
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        sink = io.BytesIO()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return ARROW_MIME, sink.getvalue()
+    records = df.assign(Data=df["Data"].dt.strftime("%Y-%m-%d")).astype(object)
+    records = records.where(records.notna(), None).to_dict(orient="records")
+    return JSON_MIME, json.dumps(records, ensure_ascii=False, default=str).encode()
+
+def make_handler(api: AvailabilityAPI):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Cabeçalhos e corpo saem em um único envio (sem a espera do Nagle/ACK atrasado no keep-alive).
+        wbufsize = 64 * 1024
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            status, headers, body = api.handle(
+                url.path.rstrip("/") or "/", url.query, self.headers.get("Accept", ""), self.headers.get("If-None-Match")
+            )
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug("%s %s", self.address_string(), format % args)
+
+    return Handler
+
+def main():
+    parser = argparse.ArgumentParser(description="API HTTP de disponibilidade das janelas.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--snapshot-dir", default=SNAPSHOT_DIR,
+                        help="snapshot gravado por janelas.ingest (vazio lê as planilhas pelo cache)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    load_terminal_plugins()
+    api = AvailabilityAPI(DashboardSource(snapshot_dir=args.snapshot_dir))
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(api))
+    logger.info("API de janelas ouvindo em %s:%d", args.host, args.port)
+    server.serve_forever()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Cache process-wide das planilhas baixadas, com cópia em disco (Arrow IPC) para
+que um processo recém-iniciado sirva a última versão sem esperar o Drive.
+"""
+import os
+import hashlib
+import logging
+import threading
+import time
+import pandas as pd
+from concurrent.futures import Future
+
+from janelas import metricas
+from janelas.snapshot import read_arrow, write_arrow
+
+# Tempo (em segundos) em que um DataFrame baixado é considerado atual.
+CACHE_TTL_SECONDS = int(os.environ.get("JANELAS_CACHE_TTL", "300"))
+# Após uma revalidação que falhou, espera (em segundos) até a próxima tentativa.
+RETRY_AFTER_FAILURE_SECONDS = 60
+# Diretório da cópia em disco das planilhas já lidas; vazio desativa.
+DISK_CACHE_DIR = os.environ.get("JANELAS_DISK_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "janelas"))
+
+logger = logging.getLogger(__name__)
+
+class DiskFrameCache:
+    """
+    Última versão lida de cada planilha, gravada em Arrow IPC (Feather v2) junto
+    com a revisão do Drive. Há um arquivo por chave do SpreadsheetCache; a
+    gravação e a leitura usam write_arrow/read_arrow do módulo snapshot.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+
+    def _path(self, key) -> str:
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{key[0]}-{digest}.arrow")
+
+    def load(self, key):
+        """Retorna (DataFrame, revisão) gravados para `key`, ou None."""
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with metricas.timer("cache.disco_leitura", key[0]):
+                df, info = read_arrow(path)
+            revision = tuple(info["revision"])
+        except Exception as e:
+            logger.warning("Cópia em disco da planilha %s ilegível, ignorada: %s", key[0], e)
+            return None
+        return df, revision
+
+    def save(self, key, df: pd.DataFrame, revision):
+        try:
+            with metricas.timer("cache.disco_gravacao", key[0]):
+                write_arrow(df, self._path(key), {"revision": list(revision)})
+        except Exception as e:
+            # Colunas com tipos mistos (texto e data na mesma coluna) não têm
+            # representação em Arrow; a planilha segue só no cache em memória.
+            logger.warning("Não foi possível gravar a cópia em disco da planilha %s: %s", key[0], e)
+
+class SpreadsheetCache:
+    """
+    Cache process-wide dos DataFrames baixados, indexado por (file_id, sheet_name).
+
+    - TTL: entradas mais novas que `ttl` segundos são devolvidas sem acessar o Drive;
+    - single-flight: sessões concorrentes pedindo o mesmo arquivo aguardam um único download;
+    - stale-while-revalidate: entradas vencidas são devolvidas na hora enquanto uma
+      thread em segundo plano busca a versão nova;
+    - revisão: a revalidação envia a revisão conhecida ao `fetcher`, que só baixa o
+      arquivo se ele mudou no Drive;
+    - falha: se a revalidação falhar, a última cópia válida continua sendo servida e
+      uma nova tentativa é feita após RETRY_AFTER_FAILURE_SECONDS;
+    - disco: com `disk`, cada versão nova é gravada em disco e, depois de um
+      reinício, a cópia gravada é servida já no primeiro acesso (como entrada
+      vencida, revalidada em segundo plano pela revisão).
+
+    Os DataFrames devolvidos são compartilhados entre sessões e não devem ser alterados.
+    """
+
+    def __init__(self, fetcher, ttl: float, disk: DiskFrameCache = None):
+        self._fetcher = fetcher
+        self._ttl = ttl
+        self._disk = disk
+        self._lock = threading.Lock()
+        self._entries = {}   # chave -> (DataFrame, revisão, instante da última validação)
+        self._inflight = {}  # chave -> Future do download em andamento
+
+    def get(self, file_id: str, sheet_name=0, usecols=None, dtype=None) -> pd.DataFrame:
+        df, _ = self.get_with_revision(file_id, sheet_name, usecols, dtype)
+        return df
+
+    def get_with_revision(self, file_id: str, sheet_name=0, usecols=None, dtype=None):
+        """Como `get`, mas retorna (DataFrame, revisão da planilha no Drive)."""
+        key = (
+            file_id,
+            sheet_name,
+            tuple(usecols) if usecols is not None else None,
+            tuple(sorted(dtype.items())) if dtype is not None else None,
+        )
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                df, revision, checked_at = entry
+                if time.monotonic() - checked_at >= self._ttl and key not in self._inflight:
+                    metricas.increment("cache.vencido", file_id)
+                    self._start_fetch(key, background=True)
+                else:
+                    metricas.increment("cache.acerto", file_id)
+                return df, revision
+            metricas.increment("cache.falta", file_id)
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._start_fetch(key, background=False)
+                owner = True
+            else:
+                owner = False
+        if owner and not self._load_from_disk(key, future):
+            self._fetch(key, future)
+        return future.result()
+
+    def _load_from_disk(self, key, future: Future) -> bool:
+        # Primeiro acesso após um reinício: serve a cópia em disco e revalida em segundo plano.
+        stored = self._disk.load(key) if self._disk is not None else None
+        if stored is None:
+            return False
+        df, revision = stored
+        metricas.increment("cache.disco", key[0])
+        with self._lock:
+            self._entries[key] = (df, revision, float("-inf"))
+            self._inflight.pop(key, None)
+            self._start_fetch(key, background=True)
+        future.set_result((df, revision))
+        return True
+
+    def _start_fetch(self, key, background: bool) -> Future:
+        # Deve ser chamado com self._lock adquirido.
+        future = Future()
+        self._inflight[key] = future
+        if background:
+            threading.Thread(target=self._fetch, args=(key, future), daemon=True).start()
+        return future
+
+    def _fetch(self, key, future: Future):
+        with self._lock:
+            entry = self._entries.get(key)
+        known_revision = entry[1] if entry is not None else None
+        try:
+            file_id, sheet_name, usecols, dtype = key
+            df, revision = self._fetcher(
+                file_id,
+                sheet_name,
+                known_revision=known_revision,
+                usecols=list(usecols) if usecols is not None else None,
+                dtype=dict(dtype) if dtype is not None else None,
+            )
+        except Exception as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+                if entry is not None:
+                    # Mantém a última cópia válida e adia a próxima tentativa, em vez de
+                    # repetir a busca (com todas as retentativas) a cada acesso.
+                    retry_at = time.monotonic() - self._ttl + min(self._ttl, RETRY_AFTER_FAILURE_SECONDS)
+                    self._entries[key] = (entry[0], entry[1], retry_at)
+            if entry is not None:
+                metricas.increment("cache.ultima_copia", key[0])
+                logger.warning("Falha ao atualizar a planilha %s; mantendo a última cópia válida: %s", key[0], e)
+            else:
+                logger.warning("Falha ao atualizar a planilha %s: %s", key[0], e)
+            future.set_exception(e)
+            return
+        if df is None:
+            # Arquivo inalterado no Drive: reaproveita o DataFrame já processado.
+            metricas.increment("cache.revisao_inalterada", key[0])
+            df = entry[0]
+        elif self._disk is not None:
+            self._disk.save(key, df, revision)
+        with self._lock:
+            self._entries[key] = (df, revision, time.monotonic())
+            self._inflight.pop(key, None)
+        future.set_result((df, revision))
@@ -0,0 +1,245 @@
+"""
+Acesso às planilhas dos terminais no Google Drive.
+
+As bibliotecas do Google (googleapiclient, google-auth, httplib2) só são
+importadas quando um cliente do Drive é de fato criado, para que quem usa
+apenas o snapshot ou o parse não pague o custo delas na importação.
+"""
+import io
+import os
+import json
+import time
+import queue
+import random
+import logging
+import threading
+import functools
+import contextlib
+import pandas as pd
+
+from janelas import metricas
+
+logger = logging.getLogger(__name__)
+
+CREDENTIALS_PATH = os.environ.get(
+    "JANELAS_CREDENTIALS_PATH", "/home/dev/Documentos/Dash-Janelas/gdrive_credentials.json"
+)
+# Timeout (em segundos) de cada requisição HTTP ao Drive.
+DRIVE_HTTP_TIMEOUT = 60
+# Máximo de clientes ociosos mantidos no pool (um por thread em uso simultâneo).
+DRIVE_POOL_SIZE = 4
+# Tamanho de cada bloco do download. Um bloco que falha é repetido a partir do
+# ponto em que parou, sem baixar de novo o que já chegou.
+DRIVE_CHUNK_SIZE = int(os.environ.get("JANELAS_DRIVE_CHUNK_MB", "4")) * 1024 * 1024
+# Retentativas de erros transitórios (429/5xx, conexão): backoff exponencial com
+# jitter, limitado a DRIVE_BACKOFF_MAX segundos por espera e ao prazo total da busca.
+DRIVE_MAX_RETRIES = 5
+DRIVE_BACKOFF_BASE = 0.5
+DRIVE_BACKOFF_MAX = 16
+DRIVE_DEADLINE_SECONDS = float(os.environ.get("JANELAS_DRIVE_DEADLINE", "90"))
+RETRY_STATUS = {429, 500, 502, 503, 504}
+# Exportar Google Sheets nativos como CSV (mais barato que XLSX). O CSV traz datas
+# e números como texto formatado pela localidade da planilha, que o Drive não
+# informa; por isso só é usado quando ativado para planilhas em pt-BR (dd/mm/aaaa).
+SHEETS_CSV_EXPORT = os.environ.get("JANELAS_SHEETS_CSV_EXPORT", "") == "1"
+# O Drive também devolve limite de requisições como 403, identificado pelo motivo do erro.
+RETRY_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}
+# Escopo pedido no token da conta de serviço. Com `http=AuthorizedHttp(...)` o
+# build() não aplica os escopos padrão da API, então eles precisam vir aqui.
+DRIVE_SCOPES = ["https://www.googleapis.com/auth/drive.readonly"]
+
+class DriveClientFactory:
+    """
+    Fábrica thread-safe de clientes do Google Drive.
+
+    As credenciais são lidas uma única vez e renovadas pelo google-auth apenas quando
+    o token expira. Cada cliente usa o documento de descoberta embutido na biblioteca
+    (sem requisição de discovery) e um `httplib2.Http` próprio, cuja conexão keep-alive
+    é reaproveitada entre chamadas. Como o httplib2 não é thread-safe, os clientes são
+    emprestados de um pool via `with factory.client() as drive_service:`.
+    """
+
+    def __init__(self, credentials_path: str, pool_size: int = DRIVE_POOL_SIZE):
+        self._credentials_path = credentials_path
+        self._credentials = None
+        self._lock = threading.Lock()
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+
+    def _get_credentials(self):
+        with self._lock:
+            if self._credentials is None:
+                from google.oauth2 import service_account
+                with metricas.timer("drive.credenciais"), open(self._credentials_path, 'r') as f:
+                    credentials_info = json.load(f)
+                self._credentials = service_account.Credentials.from_service_account_info(
+                    credentials_info, scopes=DRIVE_SCOPES
+                )
+            return self._credentials
+
+    @metricas.timer("drive.cliente")
+    def _build_client(self):
+        import httplib2
+        import google_auth_httplib2
+        from googleapiclient.discovery import build
+        http = google_auth_httplib2.AuthorizedHttp(
+            self._get_credentials(), http=httplib2.Http(timeout=DRIVE_HTTP_TIMEOUT)
+        )
+        return build('drive', 'v3', http=http, static_discovery=True, cache_discovery=False)
+
+    @contextlib.contextmanager
+    def client(self):
+        try:
+            drive_service = self._pool.get_nowait()
+        except queue.Empty:
+            drive_service = self._build_client()
+        try:
+            yield drive_service
+        finally:
+            try:
+                self._pool.put_nowait(drive_service)
+            except queue.Full:
+                pass
+
+@functools.lru_cache(maxsize=None)
+def default_drive_factory() -> DriveClientFactory:
+    """Fábrica compartilhada por todo o processo."""
+    return DriveClientFactory(CREDENTIALS_PATH)
+
+GOOGLE_SHEETS_MIME = "application/vnd.google-apps.spreadsheet"
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+try:
+    import python_calamine  # noqa: F401  (leitor XLSX em Rust, bem mais rápido que o openpyxl)
+    EXCEL_ENGINE = "calamine"
+except ImportError:
+    EXCEL_ENGINE = "openpyxl"
+
+def parse_spreadsheet(fh, file_format: str, sheet_name=0, usecols=None, dtype=None, label: str = None) -> pd.DataFrame:
+    """
+    Converte o conteúdo baixado em DataFrame.
+
+    `file_format` é "csv" (exportação de Google Sheets) ou "xlsx". Com `usecols`,
+    apenas essas colunas são lidas; colunas ausentes são ignoradas aqui para que a
+    validação de esquema de cada terminal gere a mensagem de erro adequada.
+    `label` identifica a planilha nas métricas.
+    """
+    wanted = None
+    if usecols is not None:
+        wanted_set = set(usecols)
+        wanted = lambda col: col in wanted_set
+    with metricas.timer(f"parse.{file_format}", label):
+        if file_format == "csv":
+            return pd.read_csv(fh, usecols=wanted, dtype=dtype)
+        return pd.read_excel(fh, sheet_name=sheet_name, usecols=wanted, dtype=dtype, engine=EXCEL_ENGINE)
+
+def _error_reasons(error) -> set:
+    # Motivos ("reason") de um HttpError: de error_details, quando a biblioteca já
+    # os extraiu, ou do corpo JSON da resposta ({"error": {"errors": [...]}}).
+    details = getattr(error, "error_details", None)
+    if not isinstance(details, list) or not details:
+        try:
+            details = json.loads(error.content).get("error", {}).get("errors", [])
+        except (ValueError, AttributeError, TypeError):
+            details = []
+    return {detail.get("reason") for detail in details if isinstance(detail, dict)}
+
+def _is_transient(error: Exception) -> bool:
+    import httplib2
+    from googleapiclient.errors import HttpError
+    if isinstance(error, HttpError):
+        if error.resp.status in RETRY_STATUS:
+            return True
+        return error.resp.status == 403 and bool(_error_reasons(error) & RETRY_REASONS)
+    return isinstance(error, (ConnectionError, TimeoutError, httplib2.HttpLib2Error))
+
+def _call_with_retries(call, deadline: float, file_id: str):
+    """
+    Executa `call`, repetindo erros transitórios com backoff exponencial e
+    jitter ("full jitter") até DRIVE_MAX_RETRIES vezes ou até o prazo `deadline`
+    (time.monotonic), que também é verificado antes de cada chamada. Erros
+    permanentes (404, 403 sem ser limite de requisições, ...) sobem na hora.
+    """
+    attempt = 0
+    while True:
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"prazo da consulta ao Drive ({file_id}) esgotado")
+        try:
+            return call()
+        except Exception as e:
+            if not _is_transient(e) or attempt >= DRIVE_MAX_RETRIES:
+                raise
+            delay = random.uniform(0, min(DRIVE_BACKOFF_MAX, DRIVE_BACKOFF_BASE * 2 ** attempt))
+            if time.monotonic() + delay > deadline:
+                raise TimeoutError(f"prazo da consulta ao Drive esgotado após {attempt + 1} tentativa(s): {e}") from e
+            attempt += 1
+            metricas.increment("drive.retentativa", file_id)
+            logger.warning("Erro transitório no Drive (%s), tentativa %d em %.1fs: %s", file_id, attempt + 1, delay, e)
+            time.sleep(delay)
+
+def fetch_spreadsheet(file_id: str, sheet_name: str = 0, known_revision=None, drive_factory=None,
+                      usecols=None, dtype=None, deadline_seconds: float = DRIVE_DEADLINE_SECONDS):
+    """
+    Consulta a revisão do arquivo no Google Drive e, se ela for diferente de
+    `known_revision`, faz o download e retorna (DataFrame, revisão).
+    Quando o arquivo não mudou, nada é baixado e o retorno é (None, revisão).
+    Erros transitórios são repetidos dentro de `deadline_seconds`; depois disso
+    a exceção sobe e o chamador (SpreadsheetCache) mantém a última cópia válida.
+    """
+    if drive_factory is None:
+        drive_factory = default_drive_factory()
+    deadline = time.monotonic() + deadline_seconds
+    with drive_factory.client() as drive_service:
+        return _fetch_with_client(drive_service, file_id, sheet_name, known_revision, usecols, dtype, deadline)
+
+def _fetch_with_client(drive_service, file_id: str, sheet_name, known_revision, usecols, dtype, deadline: float):
+    with metricas.timer("drive.metadados", file_id):
+        file_metadata = _call_with_retries(
+            drive_service.files().get(fileId=file_id, fields='mimeType,modifiedTime,md5Checksum,version').execute,
+            deadline,
+            file_id,
+        )
+    mime_type = file_metadata.get('mimeType')
+    # Google Sheets nativos não têm md5Checksum; nesse caso version/modifiedTime identificam a revisão.
+    revision = (
+        file_metadata.get('modifiedTime'),
+        file_metadata.get('md5Checksum'),
+        file_metadata.get('version'),
+    )
+    if known_revision is not None and revision == known_revision:
+        return None, revision
+    
+    fh = io.BytesIO()
+    if mime_type == GOOGLE_SHEETS_MIME and sheet_name == 0 and SHEETS_CSV_EXPORT:
+        # A exportação em CSV do Drive traz apenas a primeira aba, que é a usada pelos terminais,
+        # e é muito mais barata de gerar e de ler do que um XLSX (ver SHEETS_CSV_EXPORT).
+        request = drive_service.files().export_media(fileId=file_id, mimeType='text/csv')
+        file_format = "csv"
+    elif mime_type == GOOGLE_SHEETS_MIME:
+        request = drive_service.files().export_media(fileId=file_id, mimeType=XLSX_MIME)
+        file_format = "xlsx"
+    else:
+        request = drive_service.files().get_media(fileId=file_id)
+        file_format = "xlsx"
+    
+    from googleapiclient.http import MediaIoBaseDownload
+    downloader = MediaIoBaseDownload(fh, request, chunksize=DRIVE_CHUNK_SIZE)
+    done = False
+    chunks = 0
+    start = time.perf_counter()
+    while not done:
+        # O downloader só avança após um bloco completo; repetir next_chunk retoma do último byte recebido.
+        status, done = _call_with_retries(downloader.next_chunk, deadline, file_id)
+        chunks += 1
+    metricas.record("drive.download", (time.perf_counter() - start) * 1000, file_id, nbytes=fh.tell(), chunks=chunks)
+    fh.seek(0)
+    
+    df = parse_spreadsheet(fh, file_format, sheet_name=sheet_name, usecols=usecols, dtype=dtype, label=file_id)
+    return df, revision
+
+def load_spreadsheet(file_id: str, sheet_name: str = 0, usecols=None, dtype=None) -> pd.DataFrame:
+    """
+    Faz o download de um arquivo do Google Drive (Google Sheets ou Excel)
+    e retorna um DataFrame.
+    """
+    df, _ = fetch_spreadsheet(file_id, sheet_name, usecols=usecols, dtype=dtype)
+    return df
@@ -0,0 +1,104 @@
+"""
+Fonte dos dados do painel, independente do Streamlit.
+
+DashboardSource junta o snapshot da ingestão, o cache das planilhas e o
+pipeline incremental atrás de um único `load()`, usado pelo app.py e por
+consumidores sem interface. O cliente do Drive só é criado (e as bibliotecas
+do Google só são importadas) quando não há snapshot e as planilhas precisam
+ser consultadas. As planilhas lidas também ficam em disco (DiskFrameCache),
+para que o primeiro carregamento após um reinício não dependa do Drive.
+"""
+import os
+import functools
+import threading
+import pandas as pd
+
+from janelas.cache import CACHE_TTL_SECONDS, DISK_CACHE_DIR, DiskFrameCache, SpreadsheetCache
+from janelas.drive import default_drive_factory, fetch_spreadsheet
+from janelas.horarios import TIMEZONE
+from janelas.indice import UnifiedIndex, sort_unified
+from janelas.pipeline import IncrementalPipeline, load_terminals_parallel
+from janelas.snapshot import SNAPSHOT_DIR, read_snapshot, snapshot_path
+from janelas.terminais import TERMINAL_REGISTRY
+
+class SourceData:
+    """
+    Resultado de DashboardSource.load(): o índice unificado (ou None), os
+    erros por terminal, a versão dos dados (muda apenas quando alguma fonte
+    muda) e a revisão de cada planilha.
+    """
+
+    def __init__(self, unified_index: UnifiedIndex, errors: dict, version, revisions: dict):
+        self.unified_index = unified_index
+        self.errors = errors
+        self.version = version
+        self.revisions = revisions
+
+class DashboardSource:
+    """
+    Carrega o índice unificado do snapshot em `snapshot_dir`, quando existe, ou
+    direto das planilhas, via SpreadsheetCache + IncrementalPipeline. Uma
+    instância é compartilhada por todo o processo (thread-safe).
+    """
+
+    def __init__(self, snapshot_dir: str = SNAPSHOT_DIR, adapters: dict = None, fetcher=None,
+                 ttl: float = CACHE_TTL_SECONDS, disk_cache_dir: str = DISK_CACHE_DIR):
+        self.snapshot_dir = snapshot_dir
+        self.adapters = TERMINAL_REGISTRY if adapters is None else adapters
+        self._fetcher = fetcher
+        self._ttl = ttl
+        self._disk_cache_dir = disk_cache_dir
+        self._lock = threading.Lock()
+        self._cache = None
+        self._pipeline = IncrementalPipeline()
+        self._snapshot = (None, None)  # (mtime_ns, (UnifiedIndex, info))
+
+    def cache(self) -> SpreadsheetCache:
+        with self._lock:
+            if self._cache is None:
+                fetcher = self._fetcher or functools.partial(fetch_spreadsheet, drive_factory=default_drive_factory())
+                disk = DiskFrameCache(self._disk_cache_dir) if self._disk_cache_dir else None
+                self._cache = SpreadsheetCache(fetcher, ttl=self._ttl, disk=disk)
+            return self._cache
+
+    def load(self) -> SourceData:
+        if self.snapshot_dir and os.path.exists(snapshot_path(self.snapshot_dir)):
+            return self._load_snapshot(snapshot_path(self.snapshot_dir))
+        return self._load_spreadsheets()
+
+    def _load_snapshot(self, path: str) -> SourceData:
+        # Snapshot gravado pelo processo de ingestão (python -m janelas.ingest); relido só quando o mtime muda.
+        mtime_ns = os.stat(path).st_mtime_ns
+        with self._lock:
+            cached_mtime, cached = self._snapshot
+            if cached_mtime != mtime_ns:
+                df_unified, snapshot_info = read_snapshot(path)
+                cached = (UnifiedIndex(sort_unified(df_unified)), snapshot_info)
+                self._snapshot = (mtime_ns, cached)
+        unified_index, snapshot_info = cached
+        return SourceData(unified_index, dict(snapshot_info["errors"]), mtime_ns, snapshot_info["revisions"])
+
+    def _load_spreadsheets(self) -> SourceData:
+        cache = self.cache()
+        loaders = {
+            terminal: functools.partial(cache.get_with_revision, adapter.file_id, usecols=adapter.usecols, dtype=adapter.dtype)
+            for terminal, adapter in self.adapters.items()
+        }
+        terminal_sources, terminal_errors = load_terminals_parallel(loaders)
+        # Só os terminais cuja revisão mudou são reprocessados; sem mudanças, o índice em cache é reaproveitado.
+        unified_index = self._pipeline.run(terminal_sources, terminal_errors, self.adapters)
+        revisions = {terminal: revision for terminal, (_, revision) in terminal_sources.items()}
+        version = (tuple(sorted(revisions.items())), tuple(sorted(terminal_errors.items())))
+        return SourceData(unified_index, terminal_errors, version, revisions)
+
+def source_modified_times(revisions: dict) -> dict:
+    """
+    Data de modificação de cada planilha no Drive (início da revisão, em UTC),
+    convertida para o fuso do porto. Terminais sem data válida ficam de fora.
+    """
+    modified_times = {}
+    for terminal, revision in revisions.items():
+        modified = pd.to_datetime(revision[0] if revision else None, errors="coerce", utc=True)
+        if pd.notna(modified):
+            modified_times[terminal] = modified.tz_convert(TIMEZONE)
+    return modified_times
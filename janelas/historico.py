@@ -0,0 +1,138 @@
+"""
+Histórico de disponibilidade: cada snapshot ingerido de df_unified é anexado a
+um armazenamento Parquet local particionado por dia de captura
+(<dir>/dia=AAAA-MM-DD/parte-*.parquet).
+
+Só entram no histórico as linhas novas ou cuja disponibilidade mudou desde a
+captura anterior, o que mantém o volume pequeno mesmo com ingestões frequentes.
+Partições de dias encerrados são compactadas em um único arquivo e partições
+mais antigas que a retenção configurada são removidas.
+"""
+import os
+import glob
+import shutil
+import datetime
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from janelas.horarios import TIMEZONE, now_local
+from janelas.terminais import AVAILABILITY_COLS
+
+# Diretório do histórico; vazio desativa a gravação pela ingestão.
+HISTORY_DIR = os.environ.get("JANELAS_HISTORY_DIR", "")
+HISTORY_RETENTION_DAYS = int(os.environ.get("JANELAS_HISTORY_RETENTION_DAYS", "90"))
+
+KEY_COLS = ["Data", "Horário", "Terminal"]
+HISTORY_COLS = KEY_COLS + AVAILABILITY_COLS + ["captured_at"]
+# O prefixo "_" faz o pyarrow.dataset ignorar o arquivo de estado ao ler o histórico.
+STATE_FILE = "_ultimo_estado.parquet"
+PARTITIONING = ds.partitioning(pa.schema([("dia", pa.string())]), flavor="hive")
+
+def _partition_dir(history_dir: str, day: datetime.date) -> str:
+    return os.path.join(history_dir, f"dia={day.isoformat()}")
+
+def _write_parquet_atomic(df: pd.DataFrame, path: str):
+    directory, name = os.path.split(path)
+    tmp_path = os.path.join(directory, f".{name}.tmp-{os.getpid()}")
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp_path, compression="zstd")
+    os.replace(tmp_path, path)
+
+def changed_rows(df_new: pd.DataFrame, df_last: pd.DataFrame) -> pd.DataFrame:
+    """
+    Retorna as linhas de `df_new` que não existiam em `df_last` ou cuja
+    disponibilidade (ECH/EVZ/RCH/RVZ/RCS) é diferente.
+    """
+    if df_last is None or df_last.empty:
+        return df_new
+    merged = df_new[KEY_COLS + AVAILABILITY_COLS].merge(
+        df_last[KEY_COLS + AVAILABILITY_COLS], on=KEY_COLS, how="left", suffixes=("", "_anterior"), indicator=True
+    )
+    mask = merged["_merge"] == "left_only"
+    for col in AVAILABILITY_COLS:
+        mask |= merged[col] != merged[f"{col}_anterior"]
+    return df_new[mask.to_numpy()]
+
+class HistoryStore:
+    """
+    Armazenamento append-only do histórico. O último estado gravado fica em
+    `_ultimo_estado.parquet` para que a deduplicação sobreviva a reinícios.
+    """
+
+    def __init__(self, history_dir: str, retention_days: int = HISTORY_RETENTION_DAYS):
+        self.history_dir = history_dir
+        self.retention_days = retention_days
+        self._last_state = None
+
+    def _state_path(self) -> str:
+        return os.path.join(self.history_dir, STATE_FILE)
+
+    def _load_last_state(self):
+        if self._last_state is None and os.path.exists(self._state_path()):
+            self._last_state = pd.read_parquet(self._state_path())
+        return self._last_state
+
+    def append(self, df_unified: pd.DataFrame, captured_at: datetime.datetime = None) -> int:
+        """
+        Anexa as linhas alteradas de `df_unified` e retorna quantas foram
+        gravadas. `captured_at` e a partição do dia seguem o horário do porto.
+        """
+        captured_at = captured_at or now_local()
+        if captured_at.tzinfo is not None:
+            captured_at = captured_at.astimezone(TIMEZONE).replace(tzinfo=None)
+        df_current = df_unified[KEY_COLS + AVAILABILITY_COLS]
+        df_changed = changed_rows(df_current, self._load_last_state())
+        if df_changed.empty:
+            return 0
+
+        df_changed = df_changed.assign(captured_at=pd.Timestamp(captured_at))
+        partition = _partition_dir(self.history_dir, captured_at.date())
+        os.makedirs(partition, exist_ok=True)
+        _write_parquet_atomic(
+            df_changed, os.path.join(partition, f"parte-{captured_at.strftime('%H%M%S%f')}.parquet")
+        )
+        _write_parquet_atomic(df_current, self._state_path())
+        self._last_state = df_current
+        return len(df_changed)
+
+    def compact(self, today: datetime.date = None):
+        """
+        Junta os arquivos de cada partição de dia já encerrado em um único
+        arquivo e remove as partições fora da retenção.
+        """
+        today = today or now_local().date()
+        cutoff = today - datetime.timedelta(days=self.retention_days)
+        for partition in sorted(glob.glob(os.path.join(self.history_dir, "dia=*"))):
+            day = datetime.date.fromisoformat(os.path.basename(partition)[len("dia="):])
+            if day < cutoff:
+                shutil.rmtree(partition)
+                continue
+            parts = sorted(glob.glob(os.path.join(partition, "parte-*.parquet")))
+            if day >= today or len(parts) <= 1:
+                continue
+            df_day = pd.concat([pd.read_parquet(p) for p in parts], ignore_index=True)
+            df_day.sort_values(["Terminal", "Data", "Horário", "captured_at"], inplace=True)
+            _write_parquet_atomic(df_day, os.path.join(partition, "parte-compactada.parquet"))
+            for p in parts:
+                if os.path.basename(p) != "parte-compactada.parquet":
+                    os.remove(p)
+
+def read_history(history_dir: str, start: datetime.date, end: datetime.date = None,
+                 terminal: str = None, data: datetime.date = None) -> pd.DataFrame:
+    """
+    Lê o histórico capturado entre `start` e `end` (inclusive), opcionalmente
+    filtrado por terminal e pela data da janela. Apenas as partições do
+    intervalo são abertas.
+    """
+    end = end or now_local().date()
+    if not glob.glob(os.path.join(history_dir, "dia=*")):
+        return pd.DataFrame(columns=HISTORY_COLS)
+    dataset = ds.dataset(history_dir, format="parquet", partitioning=PARTITIONING)
+    expr = (ds.field("dia") >= start.isoformat()) & (ds.field("dia") <= end.isoformat())
+    if terminal is not None:
+        expr &= ds.field("Terminal") == terminal
+    if data is not None:
+        expr &= ds.field("Data") == pa.scalar(pd.Timestamp(data), pa.timestamp("s"))
+    df = dataset.to_table(columns=HISTORY_COLS, filter=expr).to_pandas()
+    return df.sort_values(["captured_at"], ignore_index=True)
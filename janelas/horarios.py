@@ -0,0 +1,124 @@
+"""
+Interpretação vetorizada da coluna Horário ("HH:MM - HH:MM").
+
+O texto é lido uma única vez na normalização e vira as colunas inteiras
+start_minute/end_minute (minutos desde 00:00), usadas em todos os filtros e
+ordenações. Janelas que cruzam a meia-noite ("22:00 - 00:00") têm end_minute
+maior que 1440; valores malformados ficam como NA.
+
+A partir dessas colunas, window_status classifica as janelas em relação ao
+horário atual do porto (America/Sao_Paulo) e open_windows/next_windows
+respondem "o que está aberto agora" e "quais são as próximas N".
+"""
+import datetime
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+
+MINUTES_PER_DAY = 24 * 60
+
+WINDOW_PATTERN = (
+    r"^\s*(?P<start_h>\d{1,2}):(?P<start_m>\d{2})(?::\d{2})?"
+    r"\s*-\s*"
+    r"(?P<end_h>\d{1,2}):(?P<end_m>\d{2})(?::\d{2})?\s*$"
+)
+
+def _parse_unique(values: pd.Series):
+    parts = values.astype("string").str.extract(WINDOW_PATTERN).apply(pd.to_numeric).astype("Int16")
+    valid = (
+        (parts["start_h"] <= 24) & (parts["end_h"] <= 24)
+        & (parts["start_m"] < 60) & (parts["end_m"] < 60)
+    ).fillna(False)
+    start = (parts["start_h"] * 60 + parts["start_m"]).where(valid)
+    end = (parts["end_h"] * 60 + parts["end_m"]).where(valid)
+    # Fim menor ou igual ao início indica janela que termina no dia seguinte.
+    end = end.mask(end <= start, end + MINUTES_PER_DAY)
+    return start.astype("Int16").array, end.astype("Int16").array
+
+def parse_window_minutes(horario: pd.Series):
+    """
+    Converte a série de textos "HH:MM - HH:MM" em duas séries Int16
+    (start_minute, end_minute) com o mesmo índice.
+
+    As planilhas repetem poucas dezenas de faixas de horário, então apenas os
+    valores distintos passam pela regex e o resultado é espalhado pelos códigos.
+    """
+    codes, uniques = pd.factorize(horario, use_na_sentinel=True)
+    start_unique, end_unique = _parse_unique(pd.Series(uniques, dtype=object))
+    # Código -1 (valor ausente) aponta para um NA acrescentado ao final.
+    start_unique = pd.array(list(start_unique) + [pd.NA], dtype="Int16")
+    end_unique = pd.array(list(end_unique) + [pd.NA], dtype="Int16")
+    start = pd.Series(start_unique.take(codes), index=horario.index, name="start_minute")
+    end = pd.Series(end_unique.take(codes), index=horario.index, name="end_minute")
+    return start, end
+
+def add_window_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Anexa start_minute/end_minute calculados a partir de Horário."""
+    start, end = parse_window_minutes(df["Horário"])
+    return df.assign(start_minute=start, end_minute=end)
+
+# =============================================================================
+# SITUAÇÃO DAS JANELAS EM RELAÇÃO AO HORÁRIO ATUAL
+# =============================================================================
+# Os horários das planilhas são sempre do porto, independentemente do fuso do servidor.
+TIMEZONE = ZoneInfo("America/Sao_Paulo")
+
+STATUS_UPCOMING = "upcoming"
+STATUS_OPEN = "open"
+STATUS_CLOSED = "closed"
+
+def now_local() -> datetime.datetime:
+    """Horário atual no fuso do porto (America/Sao_Paulo)."""
+    return datetime.datetime.now(TIMEZONE)
+
+def _wall_clock(now: datetime.datetime) -> pd.Timestamp:
+    # As janelas são horários de parede locais; `now` é convertido para o mesmo referencial.
+    if now.tzinfo is not None:
+        now = now.astimezone(TIMEZONE).replace(tzinfo=None)
+    return pd.Timestamp(now)
+
+def window_bounds(df: pd.DataFrame):
+    """Início e fim absolutos (timestamps locais) de cada janela, com precisão de minuto."""
+    day = pd.to_datetime(df["Data"], errors="coerce")
+    start = day + pd.to_timedelta(df["start_minute"].astype("Float64").to_numpy(na_value=float("nan")), unit="m")
+    end = day + pd.to_timedelta(df["end_minute"].astype("Float64").to_numpy(na_value=float("nan")), unit="m")
+    return start, end
+
+def window_status(df: pd.DataFrame, now: datetime.datetime) -> pd.Series:
+    """
+    Classifica cada janela como upcoming (ainda não começou), open (em
+    andamento) ou closed (encerrada ou com horário inválido), em uma única
+    passada vetorizada.
+    """
+    now = _wall_clock(now)
+    start, end = window_bounds(df)
+    status = np.select(
+        [(start > now).to_numpy(), ((start <= now) & (end > now)).to_numpy()],
+        [STATUS_UPCOMING, STATUS_OPEN],
+        default=STATUS_CLOSED,
+    )
+    return pd.Series(
+        pd.Categorical(status, categories=[STATUS_OPEN, STATUS_UPCOMING, STATUS_CLOSED]),
+        index=df.index,
+        name="status",
+    )
+
+def _status(df: pd.DataFrame, now: datetime.datetime) -> pd.Series:
+    # Reaproveita a coluna status quando ela já foi calculada para o frame inteiro.
+    return df["status"] if "status" in df.columns else window_status(df, now)
+
+def open_windows(df: pd.DataFrame, now: datetime.datetime) -> pd.DataFrame:
+    """Janelas com disponibilidade abertas neste momento, das que fecham antes para as que fecham depois."""
+    df_open = df[(_status(df, now) == STATUS_OPEN) & df["has_availability"]]
+    return df_open.sort_values(["Data", "end_minute"], kind="stable")
+
+def next_windows(df: pd.DataFrame, now: datetime.datetime, n: int = 1, include_open: bool = False) -> pd.DataFrame:
+    """
+    As `n` próximas janelas com disponibilidade, em ordem de início. Com
+    `include_open`, as janelas em andamento vêm primeiro.
+    """
+    status = _status(df, now)
+    wanted = [STATUS_OPEN, STATUS_UPCOMING] if include_open else [STATUS_UPCOMING]
+    df_next = df[status.isin(wanted) & df["has_availability"]].assign(status=status)
+    return df_next.sort_values(["status", "Data", "start_minute"], kind="stable").head(n)
@@ -0,0 +1,103 @@
+"""
+Índice por (Data, Terminal) sobre o DataFrame unificado.
+
+O frame é mantido ordenado por (Data, Terminal, start_minute), de modo que cada
+dia e cada par (dia, terminal) ocupa um intervalo contíguo de linhas. As
+posições desses intervalos são calculadas uma vez e as consultas viram fatias
+posicionais (iloc), sem varrer o frame inteiro nem copiar dados. As consultas
+aceitam o dia como date ou Timestamp (a coluna Data é datetime64).
+"""
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from janelas.horarios import MINUTES_PER_DAY
+
+SORT_COLS = ["Data", "Terminal", "start_minute"]
+
+def sort_unified(df: pd.DataFrame) -> pd.DataFrame:
+    return df.sort_values(SORT_COLS, kind="stable", na_position="last", ignore_index=True)
+
+def _partition_bounds(df: pd.DataFrame) -> dict:
+    # Com o frame ordenado, as partições começam onde (Data, Terminal) muda de valor.
+    if df.empty:
+        return {}
+    data = df["Data"]
+    terminal = df["Terminal"]
+    changed = (data.ne(data.shift()) | terminal.ne(terminal.shift())).to_numpy()
+    starts = np.flatnonzero(changed)
+    stops = np.append(starts[1:], len(df))
+    bounds = {}
+    for data, terminal, start, stop in zip(data.iloc[starts], terminal.iloc[starts], starts, stops):
+        if pd.isna(data) or pd.isna(terminal):
+            continue
+        bounds.setdefault(data, {})[terminal] = (start, stop)
+    return bounds
+
+def _day_key(data) -> pd.Timestamp:
+    return pd.Timestamp(data)
+
+class UnifiedIndex:
+    """
+    Frame unificado ordenado + limites de cada partição (dia, terminal).
+    `df` deve estar ordenado por SORT_COLS (ver sort_unified).
+    """
+
+    def __init__(self, df: pd.DataFrame, bounds: dict = None):
+        self.df = df
+        self._bounds = bounds if bounds is not None else _partition_bounds(df)
+
+    def with_columns(self, **columns) -> "UnifiedIndex":
+        """Novo índice com colunas acrescentadas, reaproveitando as partições (a ordem das linhas não muda)."""
+        return UnifiedIndex(self.df.assign(**columns), self._bounds)
+
+    def days(self) -> list:
+        return sorted(self._bounds)
+
+    def terminals(self, data) -> list:
+        return list(self._bounds.get(_day_key(data), {}))
+
+    def slice(self, data, terminal: str = None) -> pd.DataFrame:
+        """Linhas de um dia (ou de um dia e terminal), como fatia do frame ordenado."""
+        day_bounds = self._bounds.get(_day_key(data))
+        if not day_bounds:
+            return self.df.iloc[0:0]
+        if terminal is not None:
+            if terminal not in day_bounds:
+                return self.df.iloc[0:0]
+            start, stop = day_bounds[terminal]
+        else:
+            start = min(b[0] for b in day_bounds.values())
+            stop = max(b[1] for b in day_bounds.values())
+        return self.df.iloc[start:stop]
+
+    def select(self, data, terminals) -> pd.DataFrame:
+        """
+        Linhas de um dia restritas a `terminals`. Com todos os terminais do dia
+        selecionados, devolve a fatia contígua do dia sem copiar dados.
+        """
+        day_terminals = self.terminals(data)
+        wanted = [terminal for terminal in day_terminals if terminal in terminals]
+        if len(wanted) == len(day_terminals):
+            return self.slice(data)
+        if len(wanted) == 1:
+            return self.slice(data, wanted[0])
+        if not wanted:
+            return self.df.iloc[0:0]
+        return pd.concat([self.slice(data, terminal) for terminal in wanted])
+
+    def select_current(self, data, terminals=None) -> pd.DataFrame:
+        """
+        Como `select` (com todos os terminais quando `terminals` é None), mas
+        incluindo antes as janelas do dia anterior que atravessam a meia-noite
+        (end_minute > 1440) e ainda alcançam `data` (ex.: "22:00 - 02:00" de
+        ontem, em andamento à 01:00 de hoje).
+        """
+        previous_day = pd.Timestamp(data) - datetime.timedelta(days=1)
+        previous = self.select(previous_day, self.terminals(previous_day) if terminals is None else terminals)
+        carried = previous[previous["end_minute"].gt(MINUTES_PER_DAY).fillna(False).to_numpy()]
+        current = self.select(data, self.terminals(data) if terminals is None else terminals)
+        if carried.empty:
+            return current
+        return pd.concat([carried, current])
@@ -0,0 +1,105 @@
+"""
+Processo de ingestão: consulta periodicamente as planilhas dos terminais,
+normaliza com o mesmo pipeline do dashboard e grava o snapshot local.
+
+Uso:
+    JANELAS_SNAPSHOT_DIR=/var/lib/janelas python -m janelas.ingest --interval 60
+"""
+import time
+import logging
+import argparse
+import functools
+
+from janelas.drive import fetch_spreadsheet
+from janelas.historico import HISTORY_DIR, HISTORY_RETENTION_DAYS, HistoryStore
+from janelas.horarios import now_local
+from janelas.pipeline import load_terminals_parallel, unify_terminals
+from janelas.snapshot import SNAPSHOT_DIR, write_snapshot
+from janelas.terminais import TERMINAL_REGISTRY, load_terminal_plugins
+
+logger = logging.getLogger(__name__)
+
+class Ingestor:
+    """
+    Mantém as últimas planilhas e revisões de cada terminal para que, a cada
+    ciclo, só os arquivos alterados no Drive sejam baixados e o snapshot só
+    seja regravado quando algo mudou.
+    """
+
+    def __init__(self, snapshot_dir: str, adapters: dict = TERMINAL_REGISTRY, history: HistoryStore = None):
+        self.snapshot_dir = snapshot_dir
+        self.adapters = adapters
+        self.history = history
+        self.frames = {}
+        self.revisions = {}
+        self.last_errors = None
+
+    def run_once(self) -> bool:
+        loaders = {
+            terminal: functools.partial(
+                fetch_spreadsheet,
+                adapter.file_id,
+                known_revision=self.revisions.get(terminal),
+                usecols=adapter.usecols,
+                dtype=adapter.dtype,
+            )
+            for terminal, adapter in self.adapters.items()
+        }
+        results, terminal_errors = load_terminals_parallel(loaders)
+
+        changed = False
+        for terminal, (df, revision) in results.items():
+            if df is not None:
+                self.frames[terminal] = df
+                self.revisions[terminal] = revision
+                changed = True
+        # Compara só os erros de carregamento: unify_terminals acrescenta os de validação ao dicionário.
+        load_errors = dict(terminal_errors)
+        if not changed and load_errors == self.last_errors:
+            return False
+        self.last_errors = load_errors
+
+        # Terminais com falha neste ciclo continuam com a última planilha válida.
+        raw_terminal_data = dict(self.frames)
+        df_unified = unify_terminals(raw_terminal_data, terminal_errors, self.adapters)
+        if df_unified is None:
+            logger.error("Nenhum terminal disponível: %s", terminal_errors)
+            return False
+        path = write_snapshot(df_unified, self.snapshot_dir, terminal_errors, self.revisions)
+        logger.info("Snapshot gravado em %s (%d linhas)", path, len(df_unified))
+        if self.history is not None:
+            appended = self.history.append(df_unified)
+            logger.info("%d linhas alteradas anexadas ao histórico", appended)
+        return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingestão das planilhas de janelas dos terminais.")
+    parser.add_argument("--snapshot-dir", default=SNAPSHOT_DIR, required=not SNAPSHOT_DIR)
+    parser.add_argument("--interval", type=float, default=60, help="intervalo entre consultas, em segundos")
+    parser.add_argument("--once", action="store_true", help="executa um único ciclo e sai")
+    parser.add_argument("--history-dir", default=HISTORY_DIR, help="diretório do histórico (vazio desativa)")
+    parser.add_argument("--retention-days", type=int, default=HISTORY_RETENTION_DAYS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    load_terminal_plugins()
+    history = HistoryStore(args.history_dir, args.retention_days) if args.history_dir else None
+    ingestor = Ingestor(args.snapshot_dir, history=history)
+    last_compaction = None
+    while True:
+        started = time.monotonic()
+        try:
+            ingestor.run_once()
+            # Dias encerrados contados no fuso do porto, como as partições do histórico.
+            today = now_local().date()
+            if history is not None and last_compaction != today:
+                history.compact(today)
+                last_compaction = today
+        except Exception:
+            logger.exception("Falha no ciclo de ingestão")
+        if args.once:
+            break
+        time.sleep(max(args.interval - (time.monotonic() - started), 0))
+
+if __name__ == "__main__":
+    main()
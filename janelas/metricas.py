@@ -0,0 +1,124 @@
+"""
+Instrumentação leve das etapas do dashboard.
+
+Cada etapa (credenciais, metadados do Drive, download, leitura da planilha,
+normalização, agrupamento, montagem das tabelas...) é medida com `timer`, que
+funciona como context manager ou decorator. Os tempos, bytes e contadores
+(acertos/faltas do cache) são acumulados por (etapa, rótulo) em METRICS, que
+alimenta o painel de administração, e cada medição é registrada como uma linha
+JSON no logger `janelas.metricas`. O rótulo identifica a fonte (file_id ou
+terminal), para saber qual planilha está deixando o painel lento.
+
+Processos sem configuração de logging própria (o app Streamlit) ligam a saída
+JSON com enable_json_log, controlada por JANELAS_METRICS_LOG: "1" escreve no
+stderr; qualquer outro valor não vazio é o caminho de um arquivo.
+"""
+import os
+import sys
+import json
+import time
+import logging
+import datetime
+import threading
+import contextlib
+
+logger = logging.getLogger(__name__)
+
+# Destino dos logs JSON das métricas: vazio (desligado), "1" (stderr) ou caminho de arquivo.
+METRICS_LOG = os.environ.get("JANELAS_METRICS_LOG", "")
+
+class Metrics:
+    """Acumuladores thread-safe de tempo, bytes e contadores por (etapa, rótulo)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages = {}    # (etapa, rótulo) -> estatísticas
+        self._counters = {}  # (contador, rótulo) -> total
+
+    @contextlib.contextmanager
+    def timer(self, stage: str, label: str = None, **fields):
+        """Mede o bloco (ou a função decorada) e registra o tempo em `stage`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, (time.perf_counter() - start) * 1000, label, **fields)
+
+    def record(self, stage: str, elapsed_ms: float, label: str = None, nbytes: int = None, **fields):
+        with self._lock:
+            stats = self._stages.setdefault(
+                (stage, label), {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "last_ms": 0.0, "bytes": 0}
+            )
+            stats["count"] += 1
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+            stats["last_ms"] = elapsed_ms
+            stats["bytes"] += nbytes or 0
+        _log_event(stage=stage, label=label, ms=round(elapsed_ms, 3), bytes=nbytes, **fields)
+
+    def increment(self, counter: str, label: str = None, n: int = 1):
+        with self._lock:
+            self._counters[(counter, label)] = self._counters.get((counter, label), 0) + n
+        _log_event(counter=counter, label=label, n=n)
+
+    def stages(self) -> list:
+        """Estatísticas por etapa, como lista de dicionários (uma linha por etapa e rótulo)."""
+        with self._lock:
+            return [
+                {"etapa": stage, "rotulo": label, **stats, "media_ms": stats["total_ms"] / stats["count"] if stats["count"] else 0.0}
+                for (stage, label), stats in sorted(self._stages.items(), key=lambda item: (item[0][0], str(item[0][1])))
+            ]
+
+    def counters(self) -> list:
+        with self._lock:
+            return [
+                {"contador": counter, "rotulo": label, "total": total}
+                for (counter, label), total in sorted(self._counters.items(), key=lambda item: (item[0][0], str(item[0][1])))
+            ]
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+
+def _log_event(**event):
+    if logger.isEnabledFor(logging.INFO):
+        event = {key: value for key, value in event.items() if value is not None}
+        event["ts"] = datetime.datetime.now().isoformat(timespec="milliseconds")
+        logger.info(json.dumps(event, ensure_ascii=False, default=str), extra={"evento": event})
+
+class JSONFormatter(logging.Formatter):
+    """Uma linha JSON por registro: o evento da métrica, ou nível/logger/mensagem para os demais."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        event = getattr(record, "evento", None)
+        if event is None:
+            event = {
+                "ts": datetime.datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+                "level": record.levelname,
+                "logger": record.name,
+                "message": record.getMessage(),
+            }
+        return json.dumps(event, ensure_ascii=False, default=str)
+
+def enable_json_log(destination: str = METRICS_LOG) -> bool:
+    """
+    Liga a saída JSON do logger `janelas.metricas` em `destination` ("1" para
+    stderr ou caminho de arquivo). Idempotente; retorna False se desligado.
+    """
+    if not destination:
+        return False
+    if any(getattr(handler, "_janelas_json", False) for handler in logger.handlers):
+        return True
+    handler = logging.StreamHandler(sys.stderr) if destination == "1" else logging.FileHandler(destination)
+    handler._janelas_json = True
+    handler.setFormatter(JSONFormatter())
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    return True
+
+# Acumulador compartilhado por todo o processo.
+METRICS = Metrics()
+timer = METRICS.timer
+record = METRICS.record
+increment = METRICS.increment
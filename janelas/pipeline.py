@@ -0,0 +1,161 @@
+"""
+Pipeline de dados: carregamento paralelo das fontes e unificação dos terminais.
+"""
+import os
+import time
+import threading
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from janelas import metricas
+from janelas.horarios import add_window_columns
+from janelas.indice import UnifiedIndex, sort_unified
+from janelas.terminais import AVAILABILITY_COLS, CATEGORY_COLS, COUNTER_DTYPE, TerminalAdapter, enforce_unified_schema
+
+# Tempo máximo (em segundos) de espera por cada fonte antes de degradar o terminal.
+SOURCE_TIMEOUT_SECONDS = float(os.environ.get("JANELAS_SOURCE_TIMEOUT", "30"))
+
+def load_terminals_parallel(loaders: dict, timeout: float = SOURCE_TIMEOUT_SECONDS):
+    """
+    Executa os carregadores de cada terminal em paralelo e retorna
+    (dados, erros): dois dicionários indexados pelo nome do terminal.
+    Um terminal que falha ou excede `timeout` aparece apenas em `erros`.
+    """
+    executor = ThreadPoolExecutor(max_workers=max(len(loaders), 1), thread_name_prefix="janelas-loader")
+    futures = {terminal: executor.submit(metricas.timer("carregamento", terminal)(loader)) for terminal, loader in loaders.items()}
+    deadline = time.monotonic() + timeout
+    data, errors = {}, {}
+    for terminal, future in futures.items():
+        try:
+            data[terminal] = future.result(timeout=max(deadline - time.monotonic(), 0))
+        except FutureTimeoutError:
+            errors[terminal] = f"tempo limite de {timeout:.0f}s excedido"
+        except Exception as e:
+            errors[terminal] = str(e)
+    # Downloads que estouraram o tempo seguem em segundo plano e alimentam o cache.
+    executor.shutdown(wait=False)
+    return data, errors
+
+def add_availability_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Anexa total_available (soma de ECH/EVZ/RCH/RVZ/RCS) e has_availability
+    (alguma operação com vaga), calculados uma vez para tabelas, KPIs e alertas.
+    """
+    availability = df[AVAILABILITY_COLS]
+    return df.assign(
+        total_available=availability.sum(axis=1).astype(COUNTER_DTYPE),
+        has_availability=(availability > 0).any(axis=1),
+    )
+
+def prepare_terminal(adapter: TerminalAdapter, df_raw: pd.DataFrame) -> pd.DataFrame:
+    """
+    Etapa por terminal: valida e normaliza a planilha com `adapter`, aplica
+    os tipos compactos do esquema unificado, agrupa por (Data, Horário) e
+    anexa as colunas de horário e de disponibilidade. Levanta ValueError se a
+    planilha não tiver as colunas esperadas.
+    """
+    terminal = adapter.name
+    with metricas.timer("normalizacao", terminal, linhas=len(df_raw)):
+        df_terminal = adapter.to_unified(df_raw)
+    with metricas.timer("agrupamento", terminal):
+        # Os tipos vêm antes da soma: texto nas colunas de disponibilidade ("-", "") vira 0, em vez de ser concatenado.
+        df_terminal = enforce_unified_schema(df_terminal)
+        df_terminal = df_terminal.groupby(["Data", "Horário", "Terminal"], as_index=False, observed=True).sum()
+    with metricas.timer("colunas_derivadas", terminal):
+        return add_availability_columns(add_window_columns(df_terminal))
+
+def prepare_terminals_parallel(raw_terminal_data: dict, adapters: dict) -> dict:
+    """
+    Executa prepare_terminal para vários terminais em paralelo, cada um com o
+    seu adaptador em `adapters`. Retorna terminal -> frame preparado, ou a
+    exceção que o terminal levantou.
+    """
+    def prepare(item):
+        terminal, df_raw = item
+        try:
+            return terminal, prepare_terminal(adapters[terminal], df_raw)
+        except Exception as e:
+            # Uma planilha inválida ou com valores inesperados degrada só o próprio terminal.
+            return terminal, e
+
+    if len(raw_terminal_data) <= 1:
+        return dict(map(prepare, raw_terminal_data.items()))
+    with ThreadPoolExecutor(max_workers=len(raw_terminal_data), thread_name_prefix="janelas-prepare") as executor:
+        return dict(executor.map(prepare, raw_terminal_data.items()))
+
+@metricas.timer("juncao")
+def combine_terminals(prepared_frames: list) -> pd.DataFrame:
+    """Junta os frames já preparados de cada terminal, ordenados para o UnifiedIndex."""
+    df = pd.concat(prepared_frames, ignore_index=True)
+    # Categorias diferentes entre terminais viram object no concat; reunifica.
+    df = df.assign(**{col: df[col].astype("category") for col in CATEGORY_COLS})
+    return sort_unified(df)
+
+def unify_terminals(raw_terminal_data: dict, terminal_errors: dict, adapters: dict) -> pd.DataFrame:
+    """
+    Normaliza a planilha de cada terminal (com o adaptador em `adapters`) e agrupa tudo no DataFrame unificado,
+    já com as colunas start_minute/end_minute extraídas de Horário e as colunas
+    de disponibilidade agregada (total_available/has_availability), ordenado
+    por (Data, Terminal, start_minute) para o UnifiedIndex.
+    Terminais cuja planilha falha na validação ou na normalização são registrados em
+    `terminal_errors` e ficam de fora. Retorna None se nenhum terminal sobrar.
+    """
+    prepared_frames = []
+    for terminal, result in prepare_terminals_parallel(raw_terminal_data, adapters).items():
+        if isinstance(result, Exception):
+            terminal_errors[terminal] = str(result)
+        else:
+            prepared_frames.append(result)
+
+    if not prepared_frames:
+        return None
+    return combine_terminals(prepared_frames)
+
+class IncrementalPipeline:
+    """
+    Versão com cache de unify_terminals para o dashboard.
+
+    Cada etapa por terminal (prepare_terminal) fica guardada junto com a revisão
+    da planilha que a gerou; a etapa final (combine_terminals + UnifiedIndex)
+    fica guardada com o conjunto de revisões de todos os terminais. Assim, um
+    rerun sem mudança nas fontes não reprocessa nada, e uma planilha alterada
+    refaz apenas o próprio terminal e a junção.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._prepared = {}  # terminal -> (revisão, frame preparado ou exceção)
+        self._combined = (None, None)  # (chave de revisões, UnifiedIndex)
+
+    def run(self, sources: dict, terminal_errors: dict, adapters: dict) -> UnifiedIndex:
+        """
+        `sources` mapeia terminal -> (DataFrame bruto, revisão), normalizado com
+        o adaptador do terminal em `adapters`. Erros de
+        preparação vão para `terminal_errors`; retorna None se nenhum terminal sobrar.
+        """
+        with self._lock:
+            changed = {
+                terminal: df_raw
+                for terminal, (df_raw, revision) in sources.items()
+                if terminal not in self._prepared or self._prepared[terminal][0] != revision
+            }
+            for terminal in sources:
+                metricas.increment("pipeline.reprocessado" if terminal in changed else "pipeline.reaproveitado", terminal)
+            for terminal, result in prepare_terminals_parallel(changed, adapters).items():
+                self._prepared[terminal] = (sources[terminal][1], result)
+
+            prepared = {}
+            for terminal in sources:
+                result = self._prepared[terminal][1]
+                if isinstance(result, Exception):
+                    terminal_errors[terminal] = str(result)
+                else:
+                    prepared[terminal] = result
+
+            if not prepared:
+                return None
+            key = tuple(sorted((terminal, self._prepared[terminal][0]) for terminal in prepared))
+            if self._combined[0] != key:
+                combined = combine_terminals([prepared[terminal] for terminal in sorted(prepared)])
+                self._combined = (key, UnifiedIndex(combined))
+            return self._combined[1]
@@ -0,0 +1,75 @@
+"""
+Snapshot local do DataFrame unificado em formato Arrow IPC (Feather v2).
+
+O processo de ingestão grava o arquivo de forma atômica (arquivo temporário +
+os.replace) e o dashboard o abre via memory-map, sem nenhum acesso ao Drive.
+write_arrow/read_arrow também servem à cópia em disco do cache de planilhas.
+"""
+import os
+import json
+import datetime
+import threading
+import pandas as pd
+
+from janelas import metricas
+
+# Diretório dos snapshots; vazio significa que o dashboard lê direto do Drive.
+SNAPSHOT_DIR = os.environ.get("JANELAS_SNAPSHOT_DIR", "")
+SNAPSHOT_FILE = "janelas_unificado.arrow"
+METADATA_KEY = b"janelas"
+
+def snapshot_path(snapshot_dir: str) -> str:
+    return os.path.join(snapshot_dir, SNAPSHOT_FILE)
+
+def write_arrow(df: pd.DataFrame, path: str, info: dict):
+    """
+    Grava `df` em Arrow IPC em `path`, com `info` (JSON) nos metadados do
+    schema. A gravação é atômica: arquivo temporário + os.replace.
+    """
+    import pyarrow as pa
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[METADATA_KEY] = json.dumps(info).encode()
+    table = table.replace_schema_metadata(metadata)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+    try:
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def read_arrow(path: str):
+    """Abre `path` via memory-map e retorna (df, info) gravados por write_arrow."""
+    import pyarrow as pa
+    with pa.memory_map(path, "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+        df = table.to_pandas()
+    return df, json.loads(table.schema.metadata[METADATA_KEY])
+
+def write_snapshot(df_unified: pd.DataFrame, snapshot_dir: str, terminal_errors: dict = None,
+                   revisions: dict = None) -> str:
+    """
+    Grava `df_unified` no snapshot, junto com os erros por terminal e as
+    revisões das planilhas de origem, e retorna o caminho do arquivo.
+    """
+    info = {
+        "generated_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "errors": terminal_errors or {},
+        "revisions": {terminal: list(rev) for terminal, rev in (revisions or {}).items()},
+    }
+    path = snapshot_path(snapshot_dir)
+    write_arrow(df_unified, path, info)
+    return path
+
+@metricas.timer("snapshot.leitura")
+def read_snapshot(path: str):
+    """
+    Abre o snapshot via memory-map e retorna (df_unified, info), onde `info`
+    traz generated_at, errors e revisions gravados pela ingestão.
+    """
+    return read_arrow(path)
@@ -0,0 +1,56 @@
+"""
+Renderização das tabelas diárias em um único bloco HTML.
+
+As faixas de cor da disponibilidade (>= 8 / 3 a 7 / 0 / demais) e a cor de
+cada terminal são calculadas de forma vetorizada sobre o DataFrame do dia e
+viram classes CSS (definidas no CSS global do app.py e, para os terminais,
+geradas a partir do registro), substituindo o
+Styler do pandas com apply/applymap por linha e por célula.
+"""
+import html
+
+import numpy as np
+import pandas as pd
+
+from janelas import metricas
+from janelas.terminais import AVAILABILITY_COLS, TERMINAL_REGISTRY
+
+def availability_classes(values: pd.DataFrame) -> pd.DataFrame:
+    """
+    Classe CSS de cada célula de disponibilidade:
+      - >= 8: disp-alta (verde, negrito);
+      - 3 a 7: disp-media (amarelo);
+      - 0: disp-zero (vermelho claro, texto acinzentado);
+      - Outros casos: disp-baixa (vermelho).
+    """
+    arr = values.to_numpy()
+    classes = np.select(
+        [arr >= 8, arr >= 3, arr == 0],
+        ["disp-alta", "disp-media", "disp-zero"],
+        default="disp-baixa",
+    )
+    return pd.DataFrame(classes, index=values.index, columns=values.columns)
+
+@metricas.timer("render.tabela")
+def build_day_table_html(df_day: pd.DataFrame, adapters: dict = None) -> str:
+    """
+    Monta a tabela HTML do dia (Horário + ECH/EVZ/RCH/RVZ/RCS) com as linhas
+    coloridas pelo terminal (adaptadores de `adapters`, por padrão os
+    registrados) e as células pela faixa de disponibilidade.
+    """
+    adapters = TERMINAL_REGISTRY if adapters is None else adapters
+    values = df_day[AVAILABILITY_COLS].fillna(0).astype("int64")
+    classes = availability_classes(values)
+    cells = pd.Series("", index=df_day.index)
+    for col in AVAILABILITY_COLS:
+        cells = cells + '<td class="' + classes[col] + '">' + values[col].astype(str) + "</td>"
+    row_classes_by_terminal = {name: f"linha-{adapter.css_slug}" for name, adapter in adapters.items()}
+    row_classes = df_day["Terminal"].astype(str).map(row_classes_by_terminal).fillna("")
+    horario = df_day["Horário"].astype(str).map(html.escape)
+    rows = '<tr class="' + row_classes + '"><td>' + horario + "</td>" + cells + "</tr>"
+
+    header = "".join(f"<th>{col}</th>" for col in ["Horário"] + AVAILABILITY_COLS)
+    return (
+        '<div class="tabela-janelas-container"><table class="tabela-janelas">'
+        f"<thead><tr>{header}</tr></thead><tbody>{''.join(rows)}</tbody></table></div>"
+    )
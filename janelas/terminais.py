@@ -0,0 +1,204 @@
+"""
+Registro de terminais.
+
+Cada terminal é um TerminalAdapter que declara a planilha de origem, as
+colunas mínimas que ela precisa ter, a função que a converte para o esquema
+unificado (Data, Horário, ECH, EVZ, RCH, RVZ, RCS, Terminal) e as cores usadas
+no dashboard. Novos terminais podem ser registrados em módulos externos,
+listados em JANELAS_TERMINAL_MODULES e carregados por load_terminal_plugins.
+"""
+import os
+import logging
+import importlib
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Colunas de disponibilidade do esquema unificado.
+AVAILABILITY_COLS = ["ECH", "EVZ", "RCH", "RVZ", "RCS"]
+UNIFIED_COLS = ["Data", "Horário"] + AVAILABILITY_COLS + ["Terminal"]
+
+# Tipos compactos do frame unificado: Data em datetime64 com resolução de
+# segundos (meia-noite de cada dia), Horário e Terminal categóricos (poucos
+# valores distintos repetidos em todas as linhas) e contadores em int32.
+DATE_DTYPE = "datetime64[s]"
+COUNTER_DTYPE = "int32"
+CATEGORY_COLS = ["Horário", "Terminal"]
+
+def to_date_column(values) -> pd.Series:
+    """Converte datas (date, Timestamp ou texto dd/mm/aaaa) para DATE_DTYPE, à meia-noite."""
+    return pd.to_datetime(values, errors="coerce", dayfirst=True).dt.normalize().astype(DATE_DTYPE)
+
+def enforce_unified_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aplica os tipos compactos do esquema unificado. Valores de disponibilidade
+    ausentes ou não numéricos viram 0 (antes do agrupamento, que os soma).
+    """
+    columns = {col: df[col].astype("category") for col in CATEGORY_COLS}
+    if df["Data"].dtype != DATE_DTYPE:
+        columns["Data"] = to_date_column(df["Data"])
+    for col in AVAILABILITY_COLS:
+        columns[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).astype(COUNTER_DTYPE)
+    return df.assign(**columns)
+
+class TerminalAdapter:
+    """
+    Fonte e mapeamento de um terminal para o esquema unificado.
+
+    `normalize` recebe a planilha já validada e retorna um DataFrame com as
+    colunas UNIFIED_COLS (linhas repetidas de (Data, Horário) são somadas
+    depois, na etapa de agrupamento).
+    """
+
+    def __init__(self, name: str, file_id: str, required_columns: list, normalize, dtype: dict = None,
+                 label: str = None, color: str = "#555555", accent_color: str = None, css_slug: str = None):
+        self.name = name
+        self.file_id = file_id
+        self.required_columns = list(required_columns)
+        self.normalize = normalize
+        self.dtype = dtype
+        self.label = label or name
+        self.color = color
+        self.accent_color = accent_color or color
+        self.css_slug = css_slug or name.lower().replace(" ", "-")
+
+    @property
+    def usecols(self) -> list:
+        # Apenas as colunas usadas na normalização são lidas das planilhas.
+        return self.required_columns
+
+    def validate(self, df: pd.DataFrame):
+        missing = [col for col in self.required_columns if col not in df.columns]
+        if missing:
+            raise ValueError(
+                f"A planilha {self.name} não possui as colunas mínimas esperadas "
+                f"(faltando: {', '.join(missing)})."
+            )
+
+    def to_unified(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Valida a planilha e a converte para o esquema unificado."""
+        self.validate(df)
+        return self.normalize(df)[UNIFIED_COLS]
+
+TERMINAL_REGISTRY = {}
+
+def register_terminal(adapter: TerminalAdapter) -> TerminalAdapter:
+    TERMINAL_REGISTRY[adapter.name] = adapter
+    return adapter
+
+def load_terminal_plugins(modules: str = None):
+    """
+    Importa os módulos de terminais adicionais (separados por vírgula); cada
+    módulo registra seus adaptadores com register_terminal ao ser importado.
+    """
+    modules = os.environ.get("JANELAS_TERMINAL_MODULES", "") if modules is None else modules
+    for module in filter(None, (m.strip() for m in modules.split(","))):
+        importlib.import_module(module)
+
+# =============================================================================
+# MAPEAMENTO DE COLUNAS PARA A PLANILHA DA MULTIRIO
+# =============================================================================
+disp_cols = [
+    "ENTREGA CHEIO Disp.",
+    "ENTREGA VAZIO Disp.",
+    "RETIRADA CHEIO Disp.",
+    "RETIRADA VAZIO Disp.",
+    "RETIRADA CARGA SOLTA Disp."
+]
+expected_multirio_cols = ["Data", "JANELAS MULTIRIO"] + disp_cols
+
+rename_map_multirio = {
+    "ENTREGA CHEIO Disp.": "ECH",
+    "ENTREGA VAZIO Disp.": "EVZ",
+    "RETIRADA CHEIO Disp.": "RCH",
+    "RETIRADA VAZIO Disp.": "RVZ",
+    "RETIRADA CARGA SOLTA Disp.": "RCS"
+}
+
+def normalize_multirio(df_multirio: pd.DataFrame) -> pd.DataFrame:
+    df_multirio_unified = df_multirio[expected_multirio_cols].copy()
+    df_multirio_unified.rename(columns={"JANELAS MULTIRIO": "Horário"}, inplace=True)
+    df_multirio_unified["Terminal"] = "Multirio"
+    df_multirio_unified["Data"] = to_date_column(df_multirio_unified["Data"])
+    df_multirio_unified.rename(columns=rename_map_multirio, inplace=True)
+    return df_multirio_unified
+
+# =============================================================================
+# PROCESSAMENTO DA PLANILHA DO RIO BRASIL TERMINAL
+# =============================================================================
+required_cols_rio = ["DATA", "HORA", "DESCRICAO", "DISPONÍVEL", "RESERVADA"]
+
+desc_to_col = {
+    "EXPORTAÇÃO CHEIO": "ECH",
+    "IMPORTAÇÃO CHEIO": "RCH",
+    "EXPORTAÇÃO VAZIO": "EVZ",
+    "IMPORTAÇÃO VAZIO": "RVZ",
+    "ENTREGA CARGA SOLTA": "RCS"
+}
+
+# Categoria das descrições fora de desc_to_col: mantêm a janela no frame, mas não somam disponibilidade.
+OTHER_DESCRIPTION = "_outros"
+DESCRICAO_DTYPE = pd.CategoricalDtype(categories=list(desc_to_col))
+
+def normalize_rio_brasil(df_info: pd.DataFrame) -> pd.DataFrame:
+    """
+    A planilha do RBT tem uma linha por (DATA, HORA, DESCRICAO). O saldo
+    (DISPONÍVEL - RESERVADA) de cada descrição vira uma das colunas ECH/EVZ/
+    RCH/RVZ/RCS em um único groupby + unstack, com uma linha por (Data, Horário).
+    """
+    descricao = df_info["DESCRICAO"].astype(DESCRICAO_DTYPE)
+    unknown = df_info.loc[descricao.isna() & df_info["DESCRICAO"].notna(), "DESCRICAO"].unique()
+    if len(unknown):
+        logger.warning(
+            "Descrições desconhecidas na planilha Rio Brasil Terminal (ignoradas): %s",
+            ", ".join(map(str, unknown)),
+        )
+    col_alvo = descricao.cat.rename_categories(desc_to_col).cat.add_categories(OTHER_DESCRIPTION).fillna(OTHER_DESCRIPTION)
+
+    disponivel = pd.to_numeric(df_info["DISPONÍVEL"], errors="coerce").fillna(0)
+    reservada = pd.to_numeric(df_info["RESERVADA"], errors="coerce").fillna(0)
+    df_saldo = pd.DataFrame({
+        "Data": df_info["DATA"],
+        "Horário": df_info["HORA"],
+        "col_alvo": col_alvo,
+        "saldo": disponivel - reservada,
+    })
+
+    df_info_unified = (
+        df_saldo.groupby(["Data", "Horário", "col_alvo"], observed=True)["saldo"].sum()
+        .unstack("col_alvo", fill_value=0)
+        .reindex(columns=AVAILABILITY_COLS, fill_value=0)
+        .reset_index()
+    )
+    df_info_unified.columns.name = None
+    # A data é convertida depois da agregação, sobre ~1/5 das linhas.
+    df_info_unified["Data"] = to_date_column(df_info_unified["Data"])
+    df_info_unified["Terminal"] = "Rio Brasil Terminal"
+    return df_info_unified[["Data", "Horário", "ECH", "EVZ", "RCH", "RVZ", "RCS", "Terminal"]]
+
+# =============================================================================
+# TERMINAIS REGISTRADOS
+# =============================================================================
+register_terminal(TerminalAdapter(
+    name="Rio Brasil Terminal",
+    file_id="1fMeKSdRvZod7FkvWLKXwsZV32W6iSmbI",  # ID da nova planilha data.xlsx
+    required_columns=required_cols_rio,
+    normalize=normalize_rio_brasil,
+    dtype={"HORA": str, "DESCRICAO": str},
+    label="Rio Brasil",
+    color="#F37529",
+    accent_color="#FF9B52",
+    css_slug="rio",
+))
+
+register_terminal(TerminalAdapter(
+    name="Multirio",
+    file_id="1gzqhOADx-VJstLHvM7VVm3iuGUuz3Vgu",  # ID da planilha janelas_multirio_corrigido.xlsx
+    required_columns=expected_multirio_cols,
+    normalize=normalize_multirio,
+    dtype={"JANELAS MULTIRIO": str},
+    color="#00397F",
+    accent_color="#0052B9",
+    css_slug="multirio",
+))